@@ -1,32 +1,29 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from datetime import date
-import numpy as np
-from os import path
 import os 
+import numbers
+
+from procesamiento import (
+    ORIGEN_CACHE, ErrorArchivoVacio, ErrorColumnasFaltantes, ErrorFormato, CuboDatos,
+    IndiceFiltros, IndiceNombres, RegistroEtapas, cargar_grupos, medir_etapa, resolver_archivos,
+    RosterIncremental, TAMANOS_PAGINA, ConsultasSQL, TablaPaginada, compactar_roster, memoria_mb, normalizar_filtros,
+    resumen_biometrico, resumen_desde_filas, sql_disponible, top5,
+)
+from procesamiento.graficos import MODO_DENSIDAD, figura_estatura_peso
 
 # --- CONFIGURACIÓN DE ARCHIVOS Y GRUPO ---
 # Nombre del archivo de datos
 FILE_NAME_DATA = 'ListadoDeEstudiantesGrupo_051.xlsx - Hoja1.csv' 
+# Origen de los listados: un archivo, un directorio o un patrón glob (p. ej. 'listados/*.xlsx').
+# Con varios archivos se cargan en paralelo y se agrega la columna 'Grupo'.
+DATA_SOURCE = os.environ.get('DASHBOARD_DATOS', FILE_NAME_DATA)
+# Modo incremental (solo con un único archivo): al agregar o modificar filas del listado se
+# procesan únicamente esas filas. El archivo se revisa cada INTERVALO_VIGILANCIA segundos.
+MODO_INCREMENTAL = os.environ.get('DASHBOARD_INCREMENTAL', '1') != '0'
+INTERVALO_VIGILANCIA = 5
 GRUPO_INFO = 'Grupo 051 (001, 050, 051)'
 # ¡INTEGRANTES DEL GRUPO ACTUALIZADOS!
 INTEGRANTES = ['Yalen Camilo Aguirre', 'Ronald Briceño', 'Samuel Alzate', 'Maria Camila Rojas', 'Juan Jose Rivera']
-REQUIRED_COLS = ['Codigo', 'Fecha_Nacimiento', 'Estatura', 'Peso', 'Nombre_Estudiante', 'Apellido_Estudiante']
-
-# --- FUNCIÓN DE CLASIFICACIÓN DE IMC ---
-def clasificar_imc(imc):
-    """Clasifica el IMC según los rangos estándar (Punto 1.d)."""
-    if pd.isna(imc):
-        return 'Sin Datos'
-    elif 18.5 <= imc < 25:
-        return 'Peso Normal'
-    elif 25 <= imc < 30:
-        return 'Sobrepeso'
-    elif imc < 18.5:
-        return 'Bajo peso'
-    else: # imc >= 30
-        return 'Obesidad'
 
 # --- CONFIGURACIÓN DE LA PÁGINA ---
 st.set_page_config(
@@ -40,144 +37,250 @@ st.set_page_config(
 show_debug_data = False
 
 # --- CARGA Y PROCESAMIENTO DE DATOS ---
-@st.cache_data
-def load_and_process_data(debug_mode):
-    """Carga y procesa el archivo de datos, intentando leer como Excel o CSV."""
+def firma_archivos(archivos):
+    """Tamaño y fecha de modificación de cada listado: cambia la clave de caché si algún archivo cambia."""
+    return tuple((ruta, os.stat(ruta).st_size, os.stat(ruta).st_mtime_ns) for ruta in archivos)
+
+def mostrar_origen_carga(ruta_cargada, origen):
+    """Mensaje con el origen de un listado cargado (caché columnar, CSV o Excel)."""
+    if origen == ORIGEN_CACHE:
+        st.info(f"✅ Archivo '{ruta_cargada}' cargado desde la caché columnar (Parquet).")
+    elif origen.tipo == 'csv':
+        st.info(f"✅ Archivo cargado exitosamente como CSV con separador '{origen.sep}' y encoding '{origen.encoding}'.")
+    else:
+        st.info(f"✅ Archivo '{ruta_cargada}' cargado exitosamente como formato Excel ({origen.tipo.upper()}).")
+
+def mostrar_error_carga(error, file_to_load):
+    """Mensaje de error de la carga, según el tipo de excepción."""
+    if isinstance(error, ImportError):
+        st.error("❌ Error de dependencia: Instala 'openpyxl' (`pip install openpyxl`) para leer Excels.")
+    elif isinstance(error, ErrorArchivoVacio):
+        st.error("❌ Error: El archivo se encontró, pero está vacío.")
+    elif isinstance(error, ErrorFormato):
+        st.error(f"❌ Error crítico de FORMATO: No se pudo leer el archivo '{file_to_load}'. Revise el contenido y encabezados.")
+    elif isinstance(error, ErrorColumnasFaltantes):
+        st.error(f"❌ Error de ENCABEZADO: Faltan las columnas esenciales: {', '.join(error.faltantes)}")
+        st.warning("Los encabezados *deben* ser: Codigo, Fecha_Nacimiento, Estatura, Peso, Nombre_Estudiante, Apellido_Estudiante")
+    else:
+        st.error(f"❌ Error durante el procesamiento de datos (cálculos/limpieza): {type(error).__name__}: {error}") 
+
+# Una entrada por firma de los listados: cada edición del archivo crea otra, así que se acotan
+@st.cache_resource(max_entries=4)
+def load_and_process_data(firma):
+    """Carga y procesa los listados detectando si son Excel o CSV (con caché Parquet por archivo).
+
+    Devuelve ``(df, etapas, memoria)``: las mediciones de la carga se guardan junto al resultado
+    para mostrarlas en el panel de debug sin que el modo debug forme parte de la clave de caché.
+    El DataFrame se compacta (categóricos, float32/int16) y se comparte entre todas las sesiones
+    sin copiarlo, por lo que se trata como solo lectura.
+    """
     
-    file_to_load = FILE_NAME_DATA
-    df = None 
+    file_to_load = DATA_SOURCE
     
-    # 1. VERIFICACIÓN DE EXISTENCIA DEL ARCHIVO
-    if not path.exists(file_to_load):
+    # 1. VERIFICACIÓN DE EXISTENCIA DE LOS ARCHIVOS
+    if not firma:
         current_dir = os.getcwd()
         st.error(f"❌ ERROR CRÍTICO DE RUTA: No se encontró el archivo '{file_to_load}'.")
         st.error(f"El script lo está buscando en la carpeta: `{current_dir}`")
         st.warning(f"👉 **Asegúrese de que '{file_to_load}' esté *directamente* en esa carpeta.**")
-        return None
+        return None, [], None
         
-    # 2. INTENTAR CARGAR COMO EXCEL (PRIORIDAD: Esto manejará tu archivo .xlsx renombrado a .csv)
+    # 2. DETECTAR FORMATO (magic bytes / muestra) Y CARGAR, O LEER LA CACHÉ COLUMNAR SI EXISTE
+    registro_carga = RegistroEtapas()
     try:
-        df = pd.read_excel(file_to_load)
-        st.info(f"✅ Archivo '{file_to_load}' cargado exitosamente como formato Excel (XLSX).")
-    except ImportError:
-        st.error("❌ Error de dependencia: Instala 'openpyxl' (`pip install openpyxl`) para leer Excels.")
-        return None
-    except Exception as e_excel:
-        # 3. SI EXCEL FALLA, INTENTAR CARGAR COMO CSV (SEGUNDA OPCIÓN)
-        st.warning(f"La lectura como Excel falló. Intentando cargar como CSV...")
-        
-        load_options = [(';', 'latin-1'), (',', 'latin-1'), (';', 'utf-8'), (',', 'utf-8')]
+        df, cargados, errores = cargar_grupos(file_to_load, registro=registro_carga)
+        for ruta_error, error in errores:
+            st.warning(f"⚠️ Se omitió '{ruta_error}': {type(error).__name__}: {error}")
+        if len(cargados) > 1:
+            desde_cache = sum(1 for _, origen in cargados if origen == ORIGEN_CACHE)
+            st.info(f"✅ {len(cargados)} listados cargados en paralelo ({desde_cache} desde la caché columnar).")
+        else:
+            mostrar_origen_carga(*cargados[0])
         
-        for sep, encoding in load_options:
-            try:
-                # La lectura con inferencia de encabezados ayuda con CSV
-                df_temp = pd.read_csv(file_to_load, sep=sep, encoding=encoding, header='infer')
-                if not df_temp.empty and df_temp.shape[1] > 2:
-                    df = df_temp
-                    st.info(f"✅ Archivo cargado exitosamente como CSV con separador '{sep}' y encoding '{encoding}'.")
-                    break
-            except Exception:
-                pass
-
-        if df is None: 
-            st.error(f"❌ Error crítico de FORMATO: No se pudo leer el archivo '{file_to_load}'. Revise el contenido y encabezados.")
-            return None
-
-    if df.empty:
-        st.error("❌ Error: El archivo se encontró, pero está vacío.")
-        return None
+        with medir_etapa(registro_carga, 'compactacion', len(df)):
+            memoria = {'antes_mb': memoria_mb(df)}
+            df = compactar_roster(df)
+            memoria['despues_mb'] = memoria_mb(df)
+        return df, registro_carga.etapas, memoria
+    
+    except Exception as error:
+        mostrar_error_carga(error, file_to_load)
+        return None, [], None
 
-    # 4. Validar y limpiar columnas esenciales
+@st.cache_resource
+def obtener_roster_incremental(ruta):
+    """Listado de un único archivo en modo incremental, compartido entre sesiones.
+
+    Se construye una vez por ruta; los cambios posteriores del archivo se incorporan con
+    ``RosterIncremental.actualizar``, que procesa solo las filas nuevas o modificadas.
+    """
     try:
-        # CORRECCIÓN DE NORMALIZACIÓN: Usar un patrón más seguro que preserve los guiones bajos
-        df.columns = df.columns.str.strip().str.replace(' ', '_').str.replace('[^a-zA-Z0-9_]', '', regex=True)
-        
-        missing_cols = [col for col in REQUIRED_COLS if col not in df.columns]
-        if missing_cols:
-            st.error(f"❌ Error de ENCABEZADO: Faltan las columnas esenciales: {', '.join(missing_cols)}")
-            st.warning("Los encabezados *deben* ser: Codigo, Fecha_Nacimiento, Estatura, Peso, Nombre_Estudiante, Apellido_Estudiante")
-            return None
-            
-        df.dropna(subset=['Codigo'], inplace=True) 
-        
-        # Cálculo de Edad (Punto 1.a)
-        today = date.today()
-        # Intentar convertir la fecha usando varios formatos si el primero falla
-        df['Fecha_Nacimiento'] = pd.to_datetime(df['Fecha_Nacimiento'], errors='coerce', dayfirst=True)
-        df['Edad'] = df['Fecha_Nacimiento'].apply(lambda x: today.year - x.year - ((today.month, today.day) < (x.month, x.day)) if pd.notna(x) else np.nan)
-
-        # Normalización de Estatura y Peso (Punto 2: Estatura a Centímetros)
-        def normalize_numeric_column(value, is_estatura=False):
-            try:
-                if isinstance(value, str):
-                    value = value.replace(',', '.') 
-                val = float(value)
-                # Conversión de metros a centímetros si el valor está entre 1 y 3 
-                if is_estatura and val > 1 and val < 3:
-                    return val * 100 
-                return val
-            except:
-                return np.nan
-                
-        df['Estatura_cm'] = df['Estatura'].apply(lambda x: normalize_numeric_column(x, is_estatura=True))
-        # La columna 'Peso' ya existe, pero se recalcula con la limpieza (Punto 1.b)
-        df['Peso'] = df['Peso'].apply(normalize_numeric_column) 
-
-        # Cálculo de IMC y Clasificación (Punto 1.c y 1.d)
-        df['Estatura_m'] = df['Estatura_cm'] / 100
-        df['IMC'] = df['Peso'] / (df['Estatura_m'] ** 2)
-        df['Clasificación IMC'] = df['IMC'].apply(clasificar_imc)
-        
-        # Limpieza y estandarización de categóricos (RH, Color_Cabello, etc.)
-        for col in ['Barrio_Residencia', 'Color_Cabello', 'RH', 'Talla_Zapato']:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.strip().str.split(',').str[0].str.strip().replace('nan', np.nan)
-        
-        # Renombrar columna de estatura final
-        df = df.rename(columns={'Estatura': 'Estatura_Original', 'Estatura_cm': 'Estatura'})
-        
-        # Crear la columna de Nombre Completo para el filtro de Integrantes
-        df['Nombre_Completo'] = df['Nombre_Estudiante'].astype(str).str.strip() + ' ' + df['Apellido_Estudiante'].astype(str).str.strip()
-        
-        # Eliminar columnas intermedias
-        df = df.drop(columns=['Estatura_Original', 'Estatura_m'], errors='ignore')
-        
-        # MOSTRAR DEBUG COMPLETO SI EL CHECKBOX ESTÁ MARCADO (NUEVO)
-        if debug_mode:
-            st.sidebar.markdown("---")
-            st.sidebar.markdown(f"**DEBUG COMPLETO:** `{df.shape[0]}` filas cargadas y procesadas.")
-            # Mostrar el DataFrame completo en la barra lateral
-            st.sidebar.dataframe(df, use_container_width=True)
-            st.sidebar.markdown("---")
-        
-        return df.copy()
-    
-    except Exception as e_proc:
-        st.error(f"❌ Error durante el procesamiento de datos (cálculos/limpieza): {type(e_proc).__name__}: {e_proc}") 
+        roster = RosterIncremental(ruta)
+    except Exception as error:
+        mostrar_error_carga(error, ruta)
         return None
+    mostrar_origen_carga(ruta, roster.origen)
+    st.info(f"🔄 Modo incremental: se revisan cambios en '{ruta}' cada {INTERVALO_VIGILANCIA} segundos.")
+    return roster
 
 # --- APLICACIÓN DE FILTROS Y CONTROLES DE LA BARRA LATERAL (PRIMERA PARTE) ---
 with st.sidebar:
     st.header("⚙️ Opciones y Filtros")
 
-    # Checkbox de Debug (Controla si se muestra el DataFrame completo)
+    # Checkbox de Debug (Controla si se muestra el DataFrame completo y la medición por etapa)
     show_debug_data = st.checkbox('Mostrar datos de Debug (DataFrame completo)', value=False)
+    emitir_logs = show_debug_data and st.checkbox('Emitir mediciones como logs estructurados (JSON)', value=False)
+    # El panel se llena al final del script, cuando ya se midieron todas las etapas
+    panel_debug = st.container()
     
-    # Cargar datos con el estado del checkbox
-    df_original = load_and_process_data(show_debug_data)
+    archivos = resolver_archivos(DATA_SOURCE)
+    estado_roster = None
+    if MODO_INCREMENTAL and len(archivos) == 1:
+        roster_incremental = obtener_roster_incremental(archivos[0])
+        if roster_incremental is None:
+            # El fallo no se guarda en caché: se reintenta en la próxima ejecución
+            obtener_roster_incremental.clear()
+            df_original = None
+        else:
+            try:
+                cambios = roster_incremental.actualizar()
+            except Exception as error:
+                cambios = None
+                st.warning(f"⚠️ No se pudo incorporar el último cambio del listado (se reintentará): {type(error).__name__}: {error}")
+            if cambios:
+                st.toast(f"🔄 Listado actualizado: {cambios.nuevos} nuevos, {cambios.modificados} modificados, {cambios.eliminados} eliminados.")
+            # Una sola lectura del estado: listado, base de KPIs y cubo de la misma versión
+            estado_roster = roster_incremental.estado
+            df_original, etapas_carga, memoria_carga = estado_roster.df, roster_incremental.etapas, roster_incremental.memoria
+
+            # Vigilancia del archivo: el fragmento se vuelve a ejecutar solo y, si el archivo
+            # cambió (un stat), relanza la app completa para incorporar las filas nuevas
+            if hasattr(st, 'fragment'):
+                @st.fragment(run_every=INTERVALO_VIGILANCIA)
+                def vigilar_listado():
+                    if roster_incremental.hay_cambios():
+                        st.rerun()
+                vigilar_listado()
+    else:
+        # Cargar datos con la firma (tamaño/mtime) de los listados; el modo debug no afecta la caché
+        df_original, etapas_carga, memoria_carga = load_and_process_data(firma_archivos(archivos))
+        if df_original is None:
+            # El fallo no se guarda en caché: se reintenta en la próxima ejecución
+            load_and_process_data.clear()
     
 # Control de error FINAL: Si df_original es None, la aplicación se detiene.
 if df_original is None:
     st.stop()
+
+# Fechas de nacimiento que no se pudieron interpretar, por formato: esas filas quedan sin Edad
+reporte_fechas = df_original.attrs.get('fechas') or []
+fechas_invalidas = [fila for fila in reporte_fechas if fila['invalidos']]
+if fechas_invalidas:
+    detalle_fechas = ', '.join(f"{fila['formato']}: {fila['invalidos']}" for fila in fechas_invalidas)
+    st.sidebar.warning(
+        f"⚠️ {sum(fila['invalidos'] for fila in fechas_invalidas)} fechas de nacimiento vacías o sin interpretar ({detalle_fechas}); "
+        "esas filas quedan sin Edad y fuera de las métricas."
+    )
+
+# Registro de mediciones de esta ejecución (solo en modo debug)
+registro = RegistroEtapas(emitir_logs=emitir_logs) if show_debug_data else None
+if registro is not None:
+    registro.extender(etapas_carga, fase='carga')
+    if estado_roster is not None:
+        registro.extender(roster_incremental.etapas_actualizacion, fase='actualizacion')
+
+def fragmento(funcion):
+    """``st.fragment`` si está disponible: sus widgets solo vuelven a ejecutar esa sección."""
+    return st.fragment(funcion) if hasattr(st, 'fragment') else funcion
+
+# Tabla Arrow (y órdenes por columna) de un DataFrame compartido: una vez por versión del listado
+@st.cache_resource(max_entries=4)
+def obtener_tabla_paginada(nombre, huella, _df):
+    return TablaPaginada(_df)
+
+@fragmento
+def mostrar_tabla_paginada(tabla, clave, posiciones=None):
+    """Tabla paginada en el servidor: solo la página visible se envía al navegador.
+
+    ``posiciones`` limita la tabla a esas filas (p. ej. la selección filtrada); el orden
+    por columna es el precalculado de ``tabla``.
+    """
+    total = tabla.total_filas(posiciones)
+    col_tamano, col_orden = st.columns(2)
+    tamano = col_tamano.selectbox('Filas por página', TAMANOS_PAGINA, key=f'{clave}_tamano')
+    columna = col_orden.selectbox('Ordenar por', ['(sin ordenar)'] + tabla.columnas, key=f'{clave}_orden')
+    ascendente = st.toggle('Ascendente', value=True, key=f'{clave}_ascendente')
+    paginas = max(1, -(-total // tamano))
+    # Si cambió el total (otros filtros), la página guardada puede quedar fuera de rango
+    if st.session_state.get(f'{clave}_pagina', 1) > paginas:
+        st.session_state[f'{clave}_pagina'] = paginas
+    numero = st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, step=1, key=f'{clave}_pagina')
+    pagina = tabla.pagina(int(numero), tamano, posiciones, None if columna == '(sin ordenar)' else columna, ascendente)
+    inicio = (int(numero) - 1) * tamano
+    st.dataframe(pagina, use_container_width=True, hide_index=True)
+    st.caption(f"Filas {min(inicio + 1, total)}–{inicio + len(pagina)} de {total}")
+
+def mostrar_panel_debug(df_filtrado_actual=None):
+    """Llena el panel de debug de la barra lateral con el DataFrame, la memoria y la medición por etapa."""
+    if registro is None:
+        return
+    with panel_debug:
+        st.markdown("---")
+        st.markdown(f"**DEBUG COMPLETO:** `{df_original.shape[0]}` filas cargadas y procesadas.")
+        # Listado completo, paginado: solo se envía la página visible
+        mostrar_tabla_paginada(obtener_tabla_paginada('original', df_original.attrs.get('huella'), df_original), 'debug')
+        # Memoria: el listado compacto se comparte; cada sesión solo guarda su selección filtrada
+        memoria_sesion = 0.0 if df_filtrado_actual is df_base_kpi else memoria_mb(df_filtrado_actual)
+        st.markdown(
+            f"**Memoria:** listado `{memoria_carga['antes_mb']:.2f}` MB → `{memoria_carga['despues_mb']:.2f}` MB compacto "
+            f"(compartido) · base KPI `{memoria_mb(df_base_kpi):.2f}` MB (compartida) · esta sesión `{memoria_sesion:.2f}` MB"
+        )
+        st.markdown("**Fechas de nacimiento por formato** (valores e inválidos)")
+        st.dataframe(reporte_fechas, use_container_width=True)
+        st.markdown("**Medición por etapa** (tiempo, filas entrada/salida, memoria)")
+        st.dataframe(registro.como_dataframe(), use_container_width=True)
+        st.markdown("---")
     
 # Si llegamos aquí, df_original tiene datos.
-df = df_original.copy() 
-df_base_kpi = df.dropna(subset=['Edad', 'Estatura', 'Peso', 'IMC'])
+# Base de KPIs compartida entre sesiones (sin Edad vacía, así que la Edad queda como int16)
+@st.cache_resource(max_entries=4)
+def obtener_base_kpi(huella, _df_original):
+    return compactar_roster(_df_original.dropna(subset=['Edad', 'Estatura', 'Peso', 'IMC']))
+
+with medir_etapa(registro, 'base_kpi', len(df_original)) as medicion:
+    # En modo incremental la base y el cubo se actualizan junto con el listado
+    df_base_kpi = estado_roster.df_base if estado_roster is not None else obtener_base_kpi(df_original.attrs.get('huella'), df_original)
+    medicion['filas_salida'] = len(df_base_kpi)
 
 if df_base_kpi.empty:
     st.error("No quedan datos válidos para las métricas clave después de limpiar filas incompletas.")
     st.stop()
 
+# Índice de filtros: se construye una vez por archivo y se comparte entre sesiones
+@st.cache_resource(max_entries=4)
+def obtener_indice_filtros(huella, _df_base):
+    return IndiceFiltros(_df_base)
+
+# Índice de nombres normalizados (sin tildes, minúsculas) para el filtro por integrante
+@st.cache_resource(max_entries=4)
+def obtener_indice_nombres(huella, _df_base):
+    return IndiceNombres(_df_base['Nombre_Completo'])
+
+# Cubo de conteos/sumas para KPIs y gráficos, con su propia caché LRU de resúmenes por filtros
+@st.cache_resource(max_entries=4)
+def obtener_cubo(huella, _df_base):
+    return CuboDatos(_df_base)
+
+indice_filtros = obtener_indice_filtros(df_base_kpi.attrs.get('huella'), df_base_kpi)
+indice_nombres = obtener_indice_nombres(df_base_kpi.attrs.get('huella'), df_base_kpi)
+cubo = estado_roster.cubo if estado_roster is not None else obtener_cubo(df_base_kpi.attrs.get('huella'), df_base_kpi)
+
+# Backend SQL opcional: DuckDB sobre la caché Parquet de los listados (None si falta la caché
+# de alguno, p. ej. después de una actualización incremental que aún no se volvió a cachear)
+@st.cache_resource(max_entries=4)
+def obtener_consultas_sql(firma):
+    return ConsultasSQL.desde_listados([ruta for ruta, _, _ in firma])
+
 
 # --- APLICACIÓN DE FILTROS EN LA BARRA LATERAL (SEGUNDA PARTE) ---
 with st.sidebar:
@@ -185,16 +288,18 @@ with st.sidebar:
     
     # Punto 13: Filtro Opcional por Integrante
     st.subheader("Filtro por Integrante (Opcional)")
-    parIntegrantes = st.selectbox('Integrantes del Grupo', ['TODOS'] + INTEGRANTES, index=0)
+    # Búsqueda por prefijo sobre el índice de nombres: permite elegir cualquier estudiante del listado
+    parBusqueda = st.text_input('Buscar estudiante por nombre', placeholder='Escriba el inicio del nombre...')
+    opciones_integrantes = indice_nombres.sugerencias(parBusqueda) if parBusqueda.strip() else INTEGRANTES
+    parIntegrantes = st.selectbox('Integrantes del Grupo', ['TODOS'] + opciones_integrantes, index=0)
     
     st.subheader("Filtros Categóricos (Punto 4)")
     
-    # Punto 4: Filtros Multiselect
-    for label, col_name in [('Tipo de Sangre (RH)', 'RH'), ('Color de Cabello', 'Color_Cabello'), ('Barrio de Residencia', 'Barrio_Residencia')]:
+    # Punto 4: Filtros Multiselect (el filtro de Grupo aparece al cargar varios listados)
+    for label, col_name in [('Grupo', 'Grupo'), ('Tipo de Sangre (RH)', 'RH'), ('Color de Cabello', 'Color_Cabello'), ('Barrio de Residencia', 'Barrio_Residencia')]:
         if col_name in df_base_kpi.columns:
-            # Usamos df_original para la lista completa de valores únicos, mejor para multiselect
-            unique_values = df_base_kpi[col_name].dropna().unique()
-            globals()[f"par{col_name.replace('_', '')}"] = st.multiselect(label, sorted(unique_values))
+            # Los valores únicos (ordenados) salen del índice de filtros
+            globals()[f"par{col_name.replace('_', '')}"] = st.multiselect(label, indice_filtros.valores(col_name))
         else:
             globals()[f"par{col_name.replace('_', '')}"] = [] 
 
@@ -212,30 +317,74 @@ with st.sidebar:
         parRangoEst = st.slider('Rango de Estatura (cm)', min_est, max_est, (min_est, max_est), step=1)
     except: parRangoEst = (100, 200)
 
-# Aplicar filtros
-df_filtrado = df_base_kpi.copy()
-
-# APLICACIÓN DE FILTRO DE INTEGRANTES 
-if parIntegrantes != 'TODOS':
-    # Hacemos el filtro usando la columna Nombre_Completo generada.
-    df_filtrado = df_filtrado[df_filtrado['Nombre_Completo'].str.contains(parIntegrantes, case=False, na=False)]
-
-
-# Aplicar filtros categóricos
-if 'parRH' in locals() and parRH: df_filtrado = df_filtrado[df_filtrado['RH'].isin(parRH)]
-if 'parColorCabello' in locals() and parColorCabello: df_filtrado = df_filtrado[df_filtrado['Color_Cabello'].isin(parColorCabello)]
-if 'parBarrioResidencia' in locals() and parBarrioResidencia: df_filtrado = df_filtrado[df_filtrado['Barrio_Residencia'].isin(parBarrioResidencia)]
-
-# Aplicar filtros de rango
-df_filtrado = df_filtrado[
-    (df_filtrado['Edad'] >= parRangoEdad[0]) & (df_filtrado['Edad'] <= parRangoEdad[1]) &
-    (df_filtrado['Estatura'] >= parRangoEst[0]) & (df_filtrado['Estatura'] <= parRangoEst[1])
-]
+    # KPIs, conteos de los gráficos y Top 5 con SQL (DuckDB) en lugar del cubo en memoria
+    usar_sql = sql_disponible() and st.toggle('Consultas SQL (DuckDB sobre la caché Parquet)', value=False)
+    consultas_sql = obtener_consultas_sql(firma_archivos(archivos)) if usar_sql else None
+    if usar_sql and consultas_sql is None:
+        st.caption("ℹ️ No hay caché Parquet vigente para todos los listados: se usa el cálculo en memoria.")
+
+# APLICACIÓN DE FILTRO DE INTEGRANTES: búsqueda en el índice de nombres (exacta o por prefijo)
+posiciones_integrante = indice_nombres.posiciones(parIntegrantes) if parIntegrantes != 'TODOS' else None
+filtros_categoricos = {'Grupo': parGrupo, 'RH': parRH, 'Color_Cabello': parColorCabello, 'Barrio_Residencia': parBarrioResidencia}
+filtros_rangos = {'Edad': parRangoEdad, 'Estatura': parRangoEst}
+
+# Aplicar filtros categóricos, de rango y de integrante con los índices: una sola selección de filas, sin copias intermedias
+with medir_etapa(registro, 'filtrado', len(df_base_kpi)) as medicion:
+    posiciones_filtradas = indice_filtros.seleccionar(
+        categoricos=filtros_categoricos,
+        rangos=filtros_rangos,
+        posiciones=posiciones_integrante,
+    )
+    df_filtrado = df_base_kpi if posiciones_filtradas is None else df_base_kpi.take(posiciones_filtradas)
+    medicion['filas_salida'] = len(df_filtrado)
 
 if df_filtrado.empty:
     st.warning("No hay datos que coincidan con los filtros seleccionados.")
+    mostrar_panel_debug(df_filtrado)
     st.stop()
 
+# KPIs y datos de los gráficos: con SQL si está activo; si no, del cubo (compartido entre
+# sesiones) salvo con un integrante seleccionado
+integrante_sql = None if parIntegrantes == 'TODOS' else parIntegrantes
+if consultas_sql is not None:
+    with medir_etapa(registro, 'resumen_sql') as medicion:
+        resumen = consultas_sql.resumen(filtros_categoricos, filtros_rangos, integrante_sql)
+        medicion['filas_salida'] = resumen.total_estudiantes
+elif posiciones_integrante is None:
+    resumen = cubo.resumen(categoricos=filtros_categoricos, rangos=filtros_rangos, registro=registro)
+else:
+    resumen = resumen_desde_filas(df_filtrado, registro)
+
+
+# --- SECCIONES CACHEADAS Y FRAGMENTOS ---
+# Cada sección declara sus dependencias: la huella del listado, la combinación de filtros
+# o los datos ya agregados que dibuja. La tabla o figura se reutiliza (entre ejecuciones y
+# sesiones) mientras esas dependencias no cambien.
+huella_base = df_base_kpi.attrs.get('huella')
+clave_filtros = (huella_base, normalizar_filtros(filtros_categoricos, filtros_rangos), parIntegrantes)
+
+@st.cache_resource(max_entries=256)
+def construir_seccion(nombre, dependencias, _construir):
+    return _construir()
+
+# La dispersión guarda los puntos filtrados (hasta 100k en WebGL): caché propia y pequeña
+# para que unas pocas combinaciones de filtros no retengan cientos de figuras grandes
+@st.cache_resource(max_entries=4)
+def construir_dispersion(dependencias, _df):
+    return figura_estatura_peso(_df)
+
+def clave_tabla(df):
+    """Dependencia de un gráfico: el contenido de su tabla agregada (pocas filas)."""
+    return tuple(df.itertuples(index=False, name=None))
+
+def seccion_plegable(clave, dibujar, abierta=True):
+    """Sección con interruptor propio; apagada no se calcula ni se dibuja nada (evaluación perezosa)."""
+    @fragmento
+    def seccion():
+        if st.toggle('Mostrar sección', value=abierta, key=f'mostrar_{clave}'):
+            dibujar()
+    seccion()
+
 
 # CUERPO DEL DASHBOARD
 # Punto 6: Título
@@ -245,15 +394,23 @@ st.markdown("---")
 
 # Punto 3: Mostrar el Archivo De Excel (primeras 5 filas con columnas calculadas)
 st.subheader('📋 Datos Originales y Columnas Calculadas (Primeras 5 Filas)')
-# Mostrar las columnas calculadas Edad, Peso, IMC, Clasificación IMC
-cols_display = [col for col in df_original.columns if col not in ['Estatura_Original', 'Estatura_m', 'Nombre_Completo']]
-st.dataframe(df_original.head(5)[cols_display], use_container_width=True)
+
+def dibujar_vista_previa():
+    # Mostrar las columnas calculadas Edad, Peso, IMC, Clasificación IMC
+    # Solo depende del listado: se calcula una vez por versión del archivo
+    cols_display = [col for col in df_original.columns if col not in ['Estatura_Original', 'Estatura_m', 'Nombre_Completo']]
+    with medir_etapa(registro, 'render_vista_previa', 5):
+        vista_previa = construir_seccion('vista_previa', df_original.attrs.get('huella'), lambda: df_original.head(5)[cols_display])
+        st.dataframe(vista_previa, use_container_width=True)
+
+seccion_plegable('vista_previa', dibujar_vista_previa)
 st.markdown("---")
 
 # MOSTRAR FILA INDIVIDUAL SELECCIONADA 
 if parIntegrantes != 'TODOS':
     st.subheader(f"👤 Información Individual: {parIntegrantes}")
-    df_individual = df_filtrado[df_filtrado['Nombre_Completo'].str.contains(parIntegrantes, case=False, na=False)].head(1)
+    # df_filtrado ya contiene solo las filas del integrante seleccionado
+    df_individual = df_filtrado.head(1)
     if not df_individual.empty:
         # Seleccionar solo las columnas relevantes para la vista individual
         col_select = ['Nombre_Estudiante', 'Apellido_Estudiante', 'Codigo', 'Edad', 'Estatura', 'Peso', 'IMC', 'Clasificación IMC', 'RH', 'Color_Cabello', 'Talla_Zapato', 'Barrio_Residencia']
@@ -262,17 +419,17 @@ if parIntegrantes != 'TODOS':
         df_display = df_individual[col_select].T.reset_index()
         df_display.columns = ['Campo', 'Valor']
         # Usamos una función lambda para formatear números flotantes, dejando otros tipos como están
-        st.table(df_display.style.format({'Valor': lambda x: f'{x:.1f}' if isinstance(x, (int, float)) and x > 10 else str(x)}))
+        st.table(df_display.style.format({'Valor': lambda x: f'{x:.1f}' if isinstance(x, numbers.Real) and x > 10 else str(x)}))
 
     st.markdown("---")
 
 
 # Punto 7: KPIs (Métricas clave)
-total_estudiantes = len(df_filtrado)
-edad_promedio = df_filtrado['Edad'].mean()
-estatura_promedio = df_filtrado['Estatura'].mean()
-peso_promedio = df_filtrado['Peso'].mean()
-imc_promedio = df_filtrado['IMC'].mean()
+total_estudiantes = resumen.total_estudiantes
+edad_promedio = resumen.edad_promedio
+estatura_promedio = resumen.estatura_promedio
+peso_promedio = resumen.peso_promedio
+imc_promedio = resumen.imc_promedio
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
@@ -287,152 +444,164 @@ st.markdown("---")
 
 # 1era Fila de gráficos (Punto 8)
 st.subheader('📈 Análisis de Distribución Poblacional')
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("##### Distribución de Estudiantes por Edad (Barras)")
-    df_edad = df_filtrado.groupby('Edad').size().reset_index(name='Conteo')
-    fig_edad = px.bar(df_edad, x='Edad', y='Conteo', 
-                    title='Conteo de Estudiantes por Edad', 
-                    labels={'Conteo': 'Número de Estudiantes', 'Edad': 'Edad (años)'},
-                    color_discrete_sequence=px.colors.qualitative.Plotly)
-    st.plotly_chart(fig_edad, use_container_width=True)
-
-with col2:
-    if 'RH' in df_filtrado.columns:
-        st.markdown("##### Distribución por Tipo de Sangre (RH) (Torta)")
-        df_rh = df_filtrado.groupby('RH').size().reset_index(name='Conteo')
-        fig_rh = px.pie(df_rh, names='RH', values='Conteo', 
-                        title='Distribución por RH', 
-                        hole=.3,
-                        color_discrete_sequence=px.colors.qualitative.D3)
-        st.plotly_chart(fig_rh, use_container_width=True)
-    else:
-        st.info("La columna 'RH' no está disponible.")
 
+def dibujar_distribucion():
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("##### Distribución de Estudiantes por Edad (Barras)")
+        df_edad = resumen.conteo_edad
+        with medir_etapa(registro, 'render_edad', len(df_edad)):
+            fig_edad = construir_seccion('edad', clave_tabla(df_edad), lambda: px.bar(
+                df_edad, x='Edad', y='Conteo', 
+                title='Conteo de Estudiantes por Edad', 
+                labels={'Conteo': 'Número de Estudiantes', 'Edad': 'Edad (años)'},
+                color_discrete_sequence=px.colors.qualitative.Plotly))
+            st.plotly_chart(fig_edad, use_container_width=True)
+
+    with col2:
+        if 'RH' in df_filtrado.columns:
+            st.markdown("##### Distribución por Tipo de Sangre (RH) (Torta)")
+            df_rh = resumen.conteo_rh
+            with medir_etapa(registro, 'render_rh', len(df_rh)):
+                fig_rh = construir_seccion('rh', clave_tabla(df_rh), lambda: px.pie(
+                    df_rh, names='RH', values='Conteo', 
+                    title='Distribución por RH', 
+                    hole=.3,
+                    color_discrete_sequence=px.colors.qualitative.D3))
+                st.plotly_chart(fig_rh, use_container_width=True)
+        else:
+            st.info("La columna 'RH' no está disponible.")
+
+seccion_plegable('distribucion', dibujar_distribucion)
 st.markdown("---")
 
 # 2da Fila de gráficos (Punto 9)
 st.subheader('🏋️ Análisis Biométrico y Estilístico')
-col1, col2 = st.columns(2)
 
-with col1:
-    st.markdown("##### Relación Estatura vs Peso (Dispersión/Scatter)")
-    order_imc = ['Bajo peso', 'Peso Normal', 'Sobrepeso', 'Obesidad', 'Sin Datos']
-    
-    fig_scatter = px.scatter(df_filtrado, 
-                            x='Estatura', 
-                            y='Peso', 
-                            color='Clasificación IMC', 
-                            title='Estatura vs. Peso',
-                            labels={'Estatura': 'Estatura (cm)', 'Peso': 'Peso (kg)'},
-                            category_orders={"Clasificación IMC": order_imc},
-                            hover_data=['Nombre_Estudiante', 'Apellido_Estudiante', 'IMC'])
-    st.plotly_chart(fig_scatter, use_container_width=True)
-
-with col2:
-    if 'Color_Cabello' in df_filtrado.columns:
-        st.markdown("##### Distribución por Color de Cabello (Barras)")
-        df_cabello = df_filtrado.groupby('Color_Cabello').size().reset_index(name='Conteo').sort_values(by='Conteo', ascending=False).head(10) 
-        fig_cabello = px.bar(df_cabello, 
-                            x='Color_Cabello', 
-                            y='Conteo', 
-                            title='Conteo por Color de Cabello (Top 10)',
-                            color='Color_Cabello',
-                            color_discrete_sequence=px.colors.qualitative.Vivid)
-        st.plotly_chart(fig_cabello, use_container_width=True)
-    else:
-        st.info("La columna 'Color_Cabello' no está disponible.")
-        
+def dibujar_biometrico():
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("##### Relación Estatura vs Peso (Dispersión/Scatter)")
+        # SVG interactivo para grupos pequeños, WebGL o mapa de densidad para volúmenes grandes
+        # Depende de las filas filtradas: se reconstruye solo si cambian los filtros
+        with medir_etapa(registro, 'render_dispersion', len(df_filtrado)):
+            fig_scatter, modo_scatter = construir_dispersion(clave_filtros, df_filtrado)
+            if modo_scatter == MODO_DENSIDAD:
+                st.caption(f"Mostrando densidad agregada de {len(df_filtrado):,} estudiantes; el detalle al pasar el cursor usa una muestra.")
+            st.plotly_chart(fig_scatter, use_container_width=True)
+
+    with col2:
+        if 'Color_Cabello' in df_filtrado.columns:
+            st.markdown("##### Distribución por Color de Cabello (Barras)")
+            df_cabello = resumen.top_cabello
+            with medir_etapa(registro, 'render_cabello', len(df_cabello)):
+                fig_cabello = construir_seccion('cabello', clave_tabla(df_cabello), lambda: px.bar(
+                    df_cabello, 
+                    x='Color_Cabello', 
+                    y='Conteo', 
+                    title='Conteo por Color de Cabello (Top 10)',
+                    color='Color_Cabello',
+                    color_discrete_sequence=px.colors.qualitative.Vivid))
+                st.plotly_chart(fig_cabello, use_container_width=True)
+        else:
+            st.info("La columna 'Color_Cabello' no está disponible.")
+
+seccion_plegable('biometrico', dibujar_biometrico)
 st.markdown("---")
 
 # 3ra Fila de gráficos (Punto 10)
 st.subheader('📍 Análisis de Tendencias y Residencia')
-col1, col2 = st.columns(2)
-
-with col1:
-    if 'Talla_Zapato' in df_filtrado.columns:
-        st.markdown("##### Distribución de Tallas de Zapatos (Línea)")
-        df_zapatos = df_filtrado.dropna(subset=['Talla_Zapato']).copy()
-        df_zapatos['Talla_Zapato'] = pd.to_numeric(df_zapatos['Talla_Zapato'], errors='coerce')
-        df_zapatos.dropna(subset=['Talla_Zapato'], inplace=True)
-        
-        df_zapatos = df_zapatos.groupby('Talla_Zapato').size().reset_index(name='Conteo').sort_values(by='Talla_Zapato')
-        
-        fig_zapatos = px.line(df_zapatos, 
-                            x='Talla_Zapato', 
-                            y='Conteo', 
-                            title='Distribución de Tallas de Zapatos', 
-                            markers=True, 
-                            line_shape='spline',
-                            labels={'Talla_Zapato': 'Talla de Zapato', 'Conteo': 'Número de Estudiantes'})
-        st.plotly_chart(fig_zapatos, use_container_width=True)
-    else:
-        st.info("La columna 'Talla_Zapato' no está disponible para el gráfico.")
-
-with col2:
-    if 'Barrio_Residencia' in df_filtrado.columns:
-        st.markdown("##### Top 10 Barrios de Residencia (Barras)")
-        df_barrios = df_filtrado.groupby('Barrio_Residencia').size().reset_index(name='Conteo').sort_values(by='Conteo', ascending=False).head(10)
-        fig_barrios = px.bar(df_barrios, 
-                            x='Barrio_Residencia', 
-                            y='Conteo', 
-                            title='Top 10 Barrios',
-                            color='Conteo',
-                            color_continuous_scale=px.colors.sequential.Sunset)
-        st.plotly_chart(fig_barrios, use_container_width=True)
-    else:
-        st.info("La columna 'Barrio_Residencia' no está disponible para el gráfico.")
 
+def dibujar_tendencias():
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if 'Talla_Zapato' in df_filtrado.columns:
+            st.markdown("##### Distribución de Tallas de Zapatos (Línea)")
+            df_zapatos = resumen.conteo_tallas
+            
+            with medir_etapa(registro, 'render_tallas', len(df_zapatos)):
+                fig_zapatos = construir_seccion('tallas', clave_tabla(df_zapatos), lambda: px.line(
+                    df_zapatos, 
+                    x='Talla_Zapato', 
+                    y='Conteo', 
+                    title='Distribución de Tallas de Zapatos', 
+                    markers=True, 
+                    line_shape='spline',
+                    labels={'Talla_Zapato': 'Talla de Zapato', 'Conteo': 'Número de Estudiantes'}))
+                st.plotly_chart(fig_zapatos, use_container_width=True)
+        else:
+            st.info("La columna 'Talla_Zapato' no está disponible para el gráfico.")
+
+    with col2:
+        if 'Barrio_Residencia' in df_filtrado.columns:
+            st.markdown("##### Top 10 Barrios de Residencia (Barras)")
+            df_barrios = resumen.top_barrios
+            with medir_etapa(registro, 'render_barrios', len(df_barrios)):
+                fig_barrios = construir_seccion('barrios', clave_tabla(df_barrios), lambda: px.bar(
+                    df_barrios, 
+                    x='Barrio_Residencia', 
+                    y='Conteo', 
+                    title='Top 10 Barrios',
+                    color='Conteo',
+                    color_continuous_scale=px.colors.sequential.Sunset))
+                st.plotly_chart(fig_barrios, use_container_width=True)
+        else:
+            st.info("La columna 'Barrio_Residencia' no está disponible para el gráfico.")
+
+seccion_plegable('tendencias', dibujar_tendencias)
 st.markdown("---")
 
 # Tablas Top 5 y Resumen Estadístico (Puntos 11 y 12)
 st.subheader('🏆 Tablas y Resumen Estadístico')
-col_top1, col_top2, col_desc = st.columns([1, 1, 1.5]) 
-
-def format_describe_df(series, name):
-    """Función auxiliar para formatear la salida del .describe()"""
-    df_desc = series.describe().reset_index().rename(columns={'index': 'Métrica', series.name: 'Valor'})
-    df_desc['Valor'] = df_desc.apply(
-        lambda row: f"{int(row['Valor'])}" if row['Métrica'] == 'count' else f"{row['Valor']:.1f}", 
-        axis=1
-    )
-    df_desc.insert(1, 'Unidad', name)
-    return df_desc
-
-with col_top1:
-    # Punto 11: Top 5 Mayor Estatura
-    st.markdown("##### Top 5 Mayor Estatura (cm)")
-    top_estatura = df_filtrado.sort_values(by='Estatura', ascending=False).head(5)[
-        ['Nombre_Estudiante', 'Apellido_Estudiante', 'Estatura', 'Edad']
-    ].reset_index(drop=True)
-    top_estatura.index = top_estatura.index + 1 
-    st.table(top_estatura.style.format({'Estatura': '{:.1f}'}))
-
-with col_top2:
-    # Punto 11: Top 5 Mayor Peso
-    st.markdown("##### Top 5 Mayor Peso (kg)")
-    top_peso = df_filtrado.sort_values(by='Peso', ascending=False).head(5)[
-        ['Nombre_Estudiante', 'Apellido_Estudiante', 'Peso', 'Estatura', 'IMC']
-    ].reset_index(drop=True)
-    top_peso.index = top_peso.index + 1
-    st.table(top_peso.style.format({'Peso': '{:.1f}', 'Estatura': '{:.1f}', 'IMC': '{:.1f}'}))
-
-with col_desc:
-    # Punto 12: Resumen Estadístico de Estatura, Peso, IMC
-    st.markdown("##### Resumen Biométrico (Estatura, Peso, IMC)")
-    if 'Estatura' in df_filtrado.columns and 'Peso' in df_filtrado.columns and 'IMC' in df_filtrado.columns:
-        
-        desc_est = format_describe_df(df_filtrado['Estatura'], 'cm').set_index('Métrica')
-        desc_peso = format_describe_df(df_filtrado['Peso'], 'kg').set_index('Métrica')
-        desc_imc = format_describe_df(df_filtrado['IMC'], '').set_index('Métrica')
-        
-        combined_desc = pd.concat([desc_est, desc_peso, desc_imc], axis=1)
-        # Reordenar las columnas para mostrar (Valor, Unidad)
-        combined_desc.columns = pd.MultiIndex.from_product([['Estatura', 'Peso', 'IMC'], ['Unidad', 'Valor']])
-        combined_desc = combined_desc.loc[['count', 'mean', 'std', 'min', 'max', '25%', '50%', '75%']] 
-        
-        # Muestra la tabla de resumen
-        st.dataframe(combined_desc.iloc[:, [1, 0, 3, 2, 5, 4]], use_container_width=True)
-    else:
-        st.warning("Faltan datos para el resumen estadístico.")
\ No newline at end of file
+
+def calcular_top5(columna):
+    if consultas_sql is not None:
+        return consultas_sql.top5(columna, filtros_categoricos, filtros_rangos, integrante_sql)
+    return top5(df_filtrado, columna)
+
+def dibujar_tablas():
+    col_top1, col_top2, col_desc = st.columns([1, 1, 1.5]) 
+    motor = 'sql' if consultas_sql is not None else 'pandas'
+
+    # Las tres tablas dependen de las filas filtradas: se recalculan solo si cambian los filtros
+    with col_top1:
+        # Punto 11: Top 5 Mayor Estatura
+        st.markdown("##### Top 5 Mayor Estatura (cm)")
+        with medir_etapa(registro, 'top5_estatura', len(df_filtrado)):
+            st.table(construir_seccion(f'top5_estatura_{motor}', clave_filtros, lambda: calcular_top5('Estatura')).style.format({'Estatura': '{:.1f}'}))
+
+    with col_top2:
+        # Punto 11: Top 5 Mayor Peso
+        st.markdown("##### Top 5 Mayor Peso (kg)")
+        with medir_etapa(registro, 'top5_peso', len(df_filtrado)):
+            st.table(construir_seccion(f'top5_peso_{motor}', clave_filtros, lambda: calcular_top5('Peso')).style.format({'Peso': '{:.1f}', 'Estatura': '{:.1f}', 'IMC': '{:.1f}'}))
+
+    with col_desc:
+        # Punto 12: Resumen Estadístico de Estatura, Peso, IMC
+        st.markdown("##### Resumen Biométrico (Estatura, Peso, IMC)")
+        if 'Estatura' in df_filtrado.columns and 'Peso' in df_filtrado.columns and 'IMC' in df_filtrado.columns:
+            
+            # Muestra la tabla de resumen
+            with medir_etapa(registro, 'resumen_biometrico', len(df_filtrado)):
+                st.dataframe(construir_seccion('resumen_biometrico', clave_filtros, lambda: resumen_biometrico(df_filtrado)), use_container_width=True)
+        else:
+            st.warning("Faltan datos para el resumen estadístico.")
+
+seccion_plegable('tablas', dibujar_tablas)
+
+st.markdown("---")
+
+# Filas que cumplen los filtros, paginadas sobre la base de KPIs compartida (sin copiar df_filtrado)
+st.subheader('🔎 Filas Filtradas')
+
+def dibujar_filas_filtradas():
+    tabla_base = obtener_tabla_paginada('base_kpi', huella_base, df_base_kpi)
+    mostrar_tabla_paginada(tabla_base, 'filtradas', posiciones_filtradas)
+
+seccion_plegable('filas_filtradas', dibujar_filas_filtradas, abierta=False)
+
+# Panel de debug: se muestra al final para incluir la medición de todas las etapas
+mostrar_panel_debug(df_filtrado)
@@ -0,0 +1 @@
+"""Generador de listados sintéticos y benchmarks del pipeline de datos (sin Streamlit)."""
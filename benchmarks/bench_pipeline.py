@@ -0,0 +1,114 @@
+"""Benchmark de cada etapa del pipeline de datos, fuera de Streamlit.
+
+Para cada tamaño genera un listado sintético, lo escribe en disco y mide tiempo de
+reloj y pico de memoria de: lectura, procesamiento, carga completa sin caché, carga
+desde la caché Parquet, compactación, índice y aplicación de filtros, cubo y resumen
+de los gráficos, y el resumen biométrico (exacto y aproximado). Cada etapa se ejecuta dos
+veces: una para el tiempo, sin tracemalloc (que intercepta cada asignación y multiplica
+los tiempos), y otra solo para el pico de memoria. tracemalloc cubre las asignaciones de
+Python y NumPy pero no los buffers internos de Arrow.
+
+Uso::
+
+    python -m benchmarks.bench_pipeline --tamanos 1000 100000 1000000 --json resultados.json
+"""
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from procesamiento import (
+    CuboDatos, IndiceFiltros, cargar_roster, compactar_roster, leer_roster, procesar_roster,
+    resumen_biometrico,
+)
+
+from .generar_roster import generar_roster, guardar_roster
+
+TAMANOS = [1_000, 100_000, 1_000_000]
+FILTROS_EJEMPLO = {
+    'categoricos': {'RH': ['O+', 'A+'], 'Color_Cabello': ['Negro', 'Castaño'], 'Barrio_Residencia': []},
+    'rangos': {'Edad': (18, 25), 'Estatura': (160, 185)},
+}
+
+
+def medir(funcion, *args, **kwargs):
+    """Devuelve ``(resultado, segundos, pico_mb)``.
+
+    El tiempo sale de una ejecución sin tracemalloc; el pico, de una segunda ejecución con
+    tracemalloc cuyo resultado se descarta. ``funcion`` debe poder repetirse sin efectos
+    que cambien la segunda ejecución (p. ej. sin escribir la caché que luego leería).
+    """
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    try:
+        funcion(*args, **kwargs)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, segundos, pico / 1024 ** 2
+
+
+def _filtrar(df_base, indice):
+    posiciones = indice.seleccionar(**FILTROS_EJEMPLO)
+    return df_base if posiciones is None else df_base.take(posiciones)
+
+
+def ejecutar_etapas(ruta, dir_cache):
+    """Mide cada etapa sobre el archivo ``ruta``; devuelve una lista de filas de resultado."""
+    resultados = []
+
+    def registrar(etapa, funcion, *args, **kwargs):
+        resultado, segundos, pico = medir(funcion, *args, **kwargs)
+        resultados.append({'etapa': etapa, 'segundos': round(segundos, 4), 'pico_mb': round(pico, 1)})
+        return resultado
+
+    df_crudo, _ = registrar('lectura', leer_roster, ruta)
+    registrar('procesamiento', procesar_roster, df_crudo)
+    # Cada ejecución sin caché escribe en un directorio nuevo; la primera deja la caché que se lee después
+    directorios = (os.path.join(dir_cache, f'ejecucion_{i}') for i in itertools.count())
+    registrar('carga_sin_cache', lambda: cargar_roster(ruta, next(directorios)))
+    df, _ = registrar('carga_desde_cache', cargar_roster, ruta, os.path.join(dir_cache, 'ejecucion_0'))
+    df = registrar('compactacion', compactar_roster, df)
+
+    df_base = registrar('base_kpi', df.dropna, subset=['Edad', 'Estatura', 'Peso', 'IMC'])
+    indice = registrar('indice_filtros', IndiceFiltros, df_base)
+    df_filtrado = registrar('filtrado', _filtrar, df_base, indice)
+    # Sin LRU: la segunda ejecución del resumen también calcula
+    cubo = registrar('cubo', CuboDatos, df_base, tamano_lru=0)
+    registrar('resumen_graficos', cubo.resumen, **FILTROS_EJEMPLO)
+    registrar('resumen_biometrico', resumen_biometrico, df_filtrado)
+    registrar('resumen_biometrico_aprox', resumen_biometrico, df_filtrado, aproximado=True)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline del Dashboard Estudiantil.')
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--json', help='Guardar los resultados en este archivo JSON')
+    args = parser.parse_args(argv)
+
+    todos = []
+    with tempfile.TemporaryDirectory() as temporal:
+        for filas in args.tamanos:
+            ruta = os.path.join(temporal, f'roster_{filas}.csv')
+            guardar_roster(generar_roster(filas, args.semilla), ruta)
+            dir_cache = os.path.join(temporal, f'cache_{filas}')
+            for fila in ejecutar_etapas(ruta, dir_cache):
+                fila['filas'] = filas
+                todos.append(fila)
+                print(f"{filas:>10,}  {fila['etapa']:<24} {fila['segundos']:>9.4f} s  {fila['pico_mb']:>9.1f} MB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump(todos, archivo, indent=2)
+
+
+if __name__ == '__main__':
+    main()
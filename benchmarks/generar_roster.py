@@ -0,0 +1,97 @@
+"""Generador de listados sintéticos con las mismas columnas que el listado real.
+
+Incluye los valores "sucios" que aparecen en las exportaciones reales: decimales con
+coma, estaturas en metros o en centímetros, fechas en varios formatos (incluidos
+seriales de Excel), celdas vacías, espacios de más y RH/Color_Cabello con varios valores.
+
+Uso::
+
+    python -m benchmarks.generar_roster --filas 100000 --salida roster_100k.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS = ['Codigo', 'Nombre_Estudiante', 'Apellido_Estudiante', 'Fecha_Nacimiento', 'Estatura', 'Peso',
+            'RH', 'Color_Cabello', 'Talla_Zapato', 'Barrio_Residencia']
+
+NOMBRES = ['SAMUEL', 'YALEN CAMILO', 'JUAN  ESTEBAN', 'MARÍA CAMILA', 'RONALD ISSANT', 'YULIETH JOHANA',
+           'CARLOS DANIEL', 'JERÓNIMO', 'ALEJANDRO', 'ERIKA JULIETH', 'JUAN JOSÉ', 'VALENTINA', 'SEBASTIÁN']
+APELLIDOS = ['ALZATE ECHEVERRI', 'AGUIRRE ROJAS', 'GIRALDO  GIRALDO', 'ROJAS OSPINA', 'BRICEÑO  SILVA',
+             'GARCÍA NARVÁEZ', 'DAVID ZAPATA', 'APONTE CASTAÑO', 'RIVERA VERGARA', 'PEÑALOSA LLANO']
+RH = ['O+', 'A+', 'B+', 'O-', 'A-', 'AB+', 'B-', 'AB-', 'O+, A+', ' o+ ']
+COLORES = ['Negro', 'Castaño', 'Castaño Claro', 'castaño oscuro', 'Rubio', 'Mono', 'Negro, Castaño', 'Rojo']
+BARRIOS = ['Robledo', 'El Poblado', 'Manrique Oriental', 'Moravia', 'La Pradera', 'Santander (12 de octubre)',
+           'Suramérica, Itagüí', 'Yarumito, Itagüí', 'Belén', 'Laureles', 'Castilla', 'Envigado']
+FORMATOS_FECHA = ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', 'serial']
+ORIGEN_EXCEL = pd.Timestamp('1899-12-30')
+
+
+def _con_vacios(valores, rng, proporcion):
+    valores = valores.astype(object)
+    valores[rng.random(len(valores)) < proporcion] = np.nan
+    return valores
+
+
+def generar_roster(filas, semilla=0, proporcion_vacios=0.03):
+    """DataFrame crudo (sin procesar) de ``filas`` estudiantes sintéticos."""
+    rng = np.random.default_rng(semilla)
+
+    # Estatura: mitad en metros y mitad en centímetros; algunas con coma decimal
+    estatura_cm = rng.normal(170, 9, filas).round(0)
+    en_metros = rng.random(filas) < 0.5
+    estatura = np.where(en_metros, (estatura_cm / 100).round(2), estatura_cm).astype(str)
+    con_coma = rng.random(filas) < 0.3
+    estatura[con_coma] = np.char.replace(estatura[con_coma], '.', ',')
+
+    peso = rng.normal(66, 11, filas).round(1).astype(str)
+    peso_coma = rng.random(filas) < 0.3
+    peso[peso_coma] = np.char.replace(peso[peso_coma], '.', ',')
+
+    # Fechas de nacimiento en formatos mezclados
+    nacimiento = pd.Timestamp('1995-01-01') + pd.to_timedelta(rng.integers(0, 365 * 12, filas), unit='D')
+    formato = rng.integers(0, len(FORMATOS_FECHA), filas)
+    fechas = np.empty(filas, dtype=object)
+    for i, fmt in enumerate(FORMATOS_FECHA):
+        seleccion = formato == i
+        if fmt == 'serial':
+            fechas[seleccion] = ((nacimiento[seleccion] - ORIGEN_EXCEL).days).astype(str)
+        else:
+            fechas[seleccion] = nacimiento[seleccion].strftime(fmt)
+
+    df = pd.DataFrame({
+        'Codigo': 202200000000 + np.arange(filas, dtype=np.int64) * 1000 + 18,
+        'Nombre_Estudiante': np.array(NOMBRES, dtype=object)[rng.integers(0, len(NOMBRES), filas)],
+        'Apellido_Estudiante': np.array(APELLIDOS, dtype=object)[rng.integers(0, len(APELLIDOS), filas)],
+        'Fecha_Nacimiento': _con_vacios(fechas, rng, proporcion_vacios),
+        'Estatura': _con_vacios(estatura, rng, proporcion_vacios),
+        'Peso': _con_vacios(peso, rng, proporcion_vacios),
+        'RH': _con_vacios(np.array(RH, dtype=object)[rng.integers(0, len(RH), filas)], rng, proporcion_vacios),
+        'Color_Cabello': _con_vacios(np.array(COLORES, dtype=object)[rng.integers(0, len(COLORES), filas)], rng, proporcion_vacios),
+        'Talla_Zapato': _con_vacios(rng.integers(34, 46, filas).astype(float), rng, proporcion_vacios),
+        'Barrio_Residencia': _con_vacios(np.array(BARRIOS, dtype=object)[rng.integers(0, len(BARRIOS), filas)], rng, proporcion_vacios),
+    })
+    return df[COLUMNAS]
+
+
+def guardar_roster(df, salida):
+    """Escribe el listado como CSV (';' y UTF-8, permite decimales con coma) o XLSX según la extensión."""
+    if salida.lower().endswith('.xlsx'):
+        df.to_excel(salida, index=False)
+    else:
+        df.to_csv(salida, sep=';', index=False, encoding='utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Genera un listado de estudiantes sintético.')
+    parser.add_argument('--filas', type=int, default=1000)
+    parser.add_argument('--salida', default='roster_sintetico.csv', help='Archivo .csv o .xlsx de salida')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args(argv)
+    guardar_roster(generar_roster(args.filas, args.semilla), args.salida)
+    print(f"Listado sintético de {args.filas} filas guardado en '{args.salida}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""Lógica de carga y procesamiento del Dashboard Estudiantil (sin dependencia de Streamlit)."""
+
+from .derivaciones import (
+    REQUIRED_COLS,
+    ORDEN_IMC,
+    ErrorColumnasFaltantes,
+    clasificar_imc_vectorizado,
+    calcular_edad,
+    normalizar_numerico,
+    normalizar_columnas,
+    limpiar_categoricos,
+    procesar_roster,
+)
+from .fechas import combinar_reportes, detectar_formatos, parsear_fechas
+from .lectura import FormatoArchivo, ErrorFormato, ErrorArchivoVacio, detectar_formato, leer_roster
+from .cache_columnar import DIR_CACHE, huella_archivo
+from .carga import ORIGEN_CACHE, cargar_roster
+from .filtros import COLUMNAS_FILTRO_CATEGORICAS, COLUMNAS_FILTRO_RANGO, IndiceFiltros
+from .nombres import IndiceNombres, normalizar_nombre, normalizar_nombres
+from .cubo import (
+    CacheLRU, CuboDatos, ResumenDashboard, normalizar_filtros, resumen_desde_filas, resumir_celdas,
+)
+from .ingesta import cargar_grupos, grupo_desde_nombre, resolver_archivos
+from .estadisticas import (
+    AcumuladorEstadisticas, EstadisticasColumna, SketchCuantiles, acumular, estadisticas_columnas,
+    resumen_biometrico, tabla_resumen, top5,
+)
+from .instrumentacion import RegistroEtapas, medir_etapa, memoria_proceso_mb
+from .memoria import compactar_roster, memoria_mb
+from .incremental import CambiosRoster, EstadoRoster, RosterIncremental
+from .tablas import TAMANOS_PAGINA, TablaPaginada
+from .consultas_sql import ConsultasSQL, construir_predicado, sql_disponible
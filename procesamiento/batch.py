@@ -0,0 +1,190 @@
+"""Modo por lotes (sin Streamlit): reportes del dashboard para muchos listados.
+
+Cada listado se carga, limpia y agrega en un proceso del pool con el mismo código que el
+dashboard (``cargar_roster``, ``CuboDatos``, ``top5``, ``estadisticas_columnas``). Cada
+proceso escribe sus tablas en ``<salida>/<grupo>_<hash de la ruta>/`` y devuelve solo los KPIs y un
+``AcumuladorEstadisticas``; el proceso principal mantiene un número acotado de archivos
+en curso y agrega una línea a ``<salida>/resumen.jsonl`` apenas termina cada uno.
+Al final escribe ``<salida>/resumen_global.json`` con el resumen biométrico combinado
+(cuartiles aproximados del sketch, sin juntar las filas de todos los listados).
+
+Uso::
+
+    python -m procesamiento.batch 'listados/*.csv' otro_listado.xlsx --salida reportes
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from .cache_columnar import DIR_CACHE, pq
+from .carga import cargar_roster
+from .cubo import MEDIDAS, CuboDatos
+from .estadisticas import (
+    COLUMNAS_BIOMETRICAS, ORDEN_METRICAS, AcumuladorEstadisticas, acumular, estadisticas_columnas, top5,
+)
+from .ingesta import grupo_desde_nombre, resolver_archivos
+
+FORMATOS_SALIDA = ('parquet', 'json')
+ARCHIVO_RESUMEN = 'resumen.jsonl'
+ARCHIVO_GLOBAL = 'resumen_global.json'
+# Conteos por dimensión del ResumenDashboard que se guardan como tablas
+TABLAS_CONTEO = ['conteo_edad', 'conteo_rh', 'top_cabello', 'conteo_tallas', 'top_barrios']
+
+
+def _json(valor):
+    """Convierte escalares de NumPy (y NaN) a tipos serializables en JSON."""
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+def _carpeta_listado(ruta):
+    """Carpeta de salida del listado: el grupo más un hash corto de la ruta absoluta.
+
+    Así dos listados con el mismo nombre en directorios distintos no se sobrescriben.
+    """
+    ruta_absoluta = os.path.abspath(ruta)
+    return f'{grupo_desde_nombre(ruta)}_{hashlib.sha256(ruta_absoluta.encode("utf-8")).hexdigest()[:8]}'
+
+
+def _tabla_biometrica(estadisticas):
+    """Métricas numéricas (filas) por columna biométrica, sin formato de presentación."""
+    return pd.DataFrame(
+        {col: list(valores) for col, valores in estadisticas.items()},
+        index=pd.Index(ORDEN_METRICAS, name='Métrica'),
+    )
+
+
+def _guardar_tabla(df, ruta_base, formato, indice=False):
+    """Escribe la tabla en Parquet (o JSON si se pidió o falta pyarrow); devuelve la ruta.
+
+    El índice solo se guarda como columna con ``indice=True`` (p. ej. el puesto del Top 5).
+    """
+    df = df.reset_index() if indice else df.reset_index(drop=True)
+    if formato == 'parquet' and pq is not None:
+        ruta = f'{ruta_base}.parquet'
+        df.to_parquet(ruta, index=False)
+    else:
+        ruta = f'{ruta_base}.json'
+        df.to_json(ruta, orient='records', force_ascii=False, indent=2)
+    return ruta
+
+
+def reporte_listado(ruta, dir_salida, formato='parquet', dir_cache=DIR_CACHE):
+    """Procesa un listado y escribe sus tablas; devuelve ``(fila_resumen, acumulador)``.
+
+    ``fila_resumen`` trae los KPIs del dashboard y las rutas de las tablas escritas; si el
+    listado no se pudo procesar trae el error y ``acumulador`` es ``None``.
+    """
+    fila = {'archivo': ruta, 'grupo': grupo_desde_nombre(ruta)}
+    try:
+        df, _ = cargar_roster(ruta, dir_cache)
+        fila['fechas'] = df.attrs.get('fechas')
+        # Sin compactar: cada listado se usa una sola vez y float32 dejaría ruido en los reportes
+        df_base = df.dropna(subset=MEDIDAS)
+        del df
+        resumen = CuboDatos(df_base, tamano_lru=0).resumen()
+        columnas = [col for col, _ in COLUMNAS_BIOMETRICAS]
+        acumulador = acumular(df_base, columnas)
+
+        carpeta = os.path.join(dir_salida, _carpeta_listado(ruta))
+        os.makedirs(carpeta, exist_ok=True)
+        # (tabla, guardar el índice): los conteos no tienen un índice con significado
+        tablas = {nombre_tabla: (getattr(resumen, nombre_tabla), False) for nombre_tabla in TABLAS_CONTEO}
+        tablas['top5_estatura'] = (top5(df_base, 'Estatura').rename_axis('Puesto'), True)
+        tablas['top5_peso'] = (top5(df_base, 'Peso').rename_axis('Puesto'), True)
+        tablas['resumen_biometrico'] = (_tabla_biometrica(estadisticas_columnas(df_base, columnas)), True)
+        fila['tablas'] = {
+            nombre_tabla: _guardar_tabla(tabla, os.path.join(carpeta, nombre_tabla), formato, indice)
+            for nombre_tabla, (tabla, indice) in tablas.items() if tabla is not None
+        }
+        fila.update({campo: _json(getattr(resumen, campo)) for campo in [
+            'total_estudiantes', 'edad_promedio', 'estatura_promedio', 'peso_promedio', 'imc_promedio',
+        ]})
+        return fila, acumulador
+    except Exception as error:
+        fila['error'] = f'{type(error).__name__}: {error}'
+        return fila, None
+
+
+def procesar_lotes(archivos, dir_salida, formato='parquet', max_workers=None, max_pendientes=None, dir_cache=DIR_CACHE):
+    """Genera los reportes de ``archivos`` en paralelo y los va registrando al terminar.
+
+    Como máximo ``max_pendientes`` archivos (por defecto el doble de procesos) están en curso
+    a la vez, así la memoria no crece con la cantidad de listados. Devuelve el resumen global.
+    """
+    os.makedirs(dir_salida, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_pendientes = max_pendientes or 2 * max_workers
+    global_ = AcumuladorEstadisticas([col for col, _ in COLUMNAS_BIOMETRICAS])
+    procesados = errores = 0
+
+    with open(os.path.join(dir_salida, ARCHIVO_RESUMEN), 'w', encoding='utf-8') as resumen, \
+            ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pendientes = set()
+        restantes = iter(archivos)
+        while True:
+            for ruta in restantes:
+                pendientes.add(pool.submit(reporte_listado, ruta, dir_salida, formato, dir_cache))
+                if len(pendientes) >= max_pendientes:
+                    break
+            if not pendientes:
+                break
+            terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                fila, acumulador = futuro.result()
+                resumen.write(json.dumps(fila, ensure_ascii=False) + '\n')
+                resumen.flush()
+                if acumulador is None:
+                    errores += 1
+                    print(f"✗ {fila['archivo']}: {fila['error']}", file=sys.stderr)
+                else:
+                    procesados += 1
+                    global_.combinar(acumulador)
+                    print(f"✓ {fila['archivo']}: {fila['total_estudiantes']} estudiantes")
+
+    estadisticas = global_.estadisticas()
+    resumen_global = {
+        'listados': procesados,
+        'errores': errores,
+        'resumen_biometrico': {
+            col: {campo: _json(valor) for campo, valor in valores._asdict().items()}
+            for col, valores in estadisticas.items()
+        },
+    }
+    with open(os.path.join(dir_salida, ARCHIVO_GLOBAL), 'w', encoding='utf-8') as archivo:
+        json.dump(resumen_global, archivo, ensure_ascii=False, indent=2)
+    return resumen_global
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reportes del Dashboard Estudiantil para muchos listados, sin Streamlit.')
+    parser.add_argument('origenes', nargs='+', help='Archivos, directorios o patrones glob de listados')
+    parser.add_argument('--salida', default='reportes', help='Directorio de salida')
+    parser.add_argument('--formato', choices=FORMATOS_SALIDA, default='parquet', help='Formato de las tablas')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos del pool (por defecto, uno por CPU)')
+    parser.add_argument('--max-pendientes', type=int, default=None, help='Archivos en curso a la vez')
+    parser.add_argument('--dir-cache', default=DIR_CACHE, help='Directorio de la caché Parquet')
+    args = parser.parse_args(argv)
+
+    archivos = [ruta for origen in args.origenes for ruta in resolver_archivos(origen)]
+    if not archivos:
+        parser.error('No se encontraron listados en los orígenes indicados.')
+    resumen_global = procesar_lotes(
+        archivos, args.salida, args.formato, args.workers, args.max_pendientes, args.dir_cache,
+    )
+    print(f"{resumen_global['listados']} listados procesados, {resumen_global['errores']} con error; "
+          f"resultados en '{args.salida}'.")
+    return 1 if resumen_global['errores'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
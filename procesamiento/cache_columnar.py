@@ -0,0 +1,82 @@
+"""Caché en disco (Parquet) del listado ya limpio y con columnas calculadas.
+
+La clave combina ruta, tamaño, fecha de modificación y hash del contenido, de modo que
+cualquier cambio en el archivo invalida la entrada. Las lecturas usan *memory map*.
+pyarrow es opcional: sin él la caché simplemente se desactiva.
+"""
+import hashlib
+import os
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependencia opcional
+    pq = None
+
+DIR_CACHE = os.environ.get('DASHBOARD_CACHE_DIR', '.cache_dashboard')
+# Cambiar cuando cambie el procesamiento para no servir resultados con la lógica anterior
+VERSION_CACHE = '3'
+TAMANO_BLOQUE = 1024 * 1024
+
+
+def hash_contenido(ruta):
+    """SHA-256 del contenido del archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b''):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def huella_archivo(ruta):
+    """Clave de caché del archivo: ruta absoluta, tamaño, mtime y hash del contenido."""
+    estado = os.stat(ruta)
+    return huella_desde_hash(ruta, estado.st_size, estado.st_mtime_ns, hash_contenido(ruta))
+
+
+def huella_desde_hash(ruta, tamano, mtime_ns, hash_hex):
+    """Misma clave que ``huella_archivo`` con el hash del contenido ya calculado (p. ej. acumulado)."""
+    partes = [VERSION_CACHE, os.path.abspath(ruta), str(tamano), str(mtime_ns), hash_hex]
+    return hashlib.sha256('|'.join(partes).encode('utf-8')).hexdigest()[:32]
+
+
+def ruta_cache(huella, dir_cache=DIR_CACHE, sufijo=''):
+    """Ruta de la entrada; ``sufijo`` distingue datos auxiliares de la misma huella (p. ej. '.filas')."""
+    return os.path.join(dir_cache, f'{huella}{sufijo}.parquet')
+
+
+def leer_cache(huella, dir_cache=DIR_CACHE, sufijo=''):
+    """Devuelve el DataFrame cacheado (memory-mapped) o ``None`` si no existe."""
+    ruta = ruta_cache(huella, dir_cache, sufijo)
+    if pq is None or not os.path.exists(ruta):
+        return None
+    try:
+        return pq.read_table(ruta, memory_map=True).to_pandas()
+    except Exception:
+        # Entrada corrupta o de otra versión de pyarrow: se regenera
+        return None
+
+
+def guardar_cache(df, huella, dir_cache=DIR_CACHE, sufijo=''):
+    """Escribe el DataFrame en la caché de forma atómica. Devuelve ``True`` si se guardó."""
+    if pq is None:
+        return False
+    ruta = ruta_cache(huella, dir_cache, sufijo)
+    temporal = f'{ruta}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(dir_cache, exist_ok=True)
+        df.to_parquet(temporal)
+        os.replace(temporal, ruta)
+        return True
+    except Exception:
+        # Columnas que Parquet no puede representar (p. ej. tipos mezclados): sin caché
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        return False
+
+
+def borrar_cache(huella, dir_cache=DIR_CACHE, sufijo=''):
+    """Elimina la entrada si existe (p. ej. la de una versión anterior del archivo)."""
+    try:
+        os.remove(ruta_cache(huella, dir_cache, sufijo))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,32 @@
+"""Carga del listado procesado: caché columnar si existe, lectura y procesamiento si no."""
+from .cache_columnar import DIR_CACHE, guardar_cache, huella_archivo, leer_cache
+from .derivaciones import procesar_roster
+from .instrumentacion import medir_etapa
+from .lectura import leer_roster
+
+ORIGEN_CACHE = 'cache'
+
+
+def cargar_roster(ruta, dir_cache=DIR_CACHE, registro=None):
+    """Devuelve ``(df, origen)`` con el listado limpio y sus columnas calculadas.
+
+    ``origen`` es ``ORIGEN_CACHE`` si se leyó de la caché Parquet o el ``FormatoArchivo``
+    detectado si fue necesario parsear el archivo. La huella del archivo queda en
+    ``df.attrs['huella']`` para usarla como clave de cachés derivadas (índices, agregados).
+    Con un ``RegistroEtapas`` se miden la lectura y cada etapa del procesamiento.
+    """
+    with medir_etapa(registro, 'huella_archivo'):
+        huella = huella_archivo(ruta)
+    with medir_etapa(registro, 'lectura_cache') as medicion:
+        df = leer_cache(huella, dir_cache)
+        medicion['filas_salida'] = None if df is None else len(df)
+    origen = ORIGEN_CACHE
+    if df is None:
+        with medir_etapa(registro, 'lectura') as medicion:
+            df_crudo, origen = leer_roster(ruta)
+            medicion['filas_salida'] = len(df_crudo)
+        df = procesar_roster(df_crudo, registro=registro)
+        with medir_etapa(registro, 'escritura_cache', len(df)):
+            guardar_cache(df, huella, dir_cache)
+    df.attrs['huella'] = huella
+    return df, origen
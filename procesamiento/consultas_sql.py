@@ -0,0 +1,170 @@
+"""Consultas del dashboard en SQL con DuckDB, directamente sobre la caché Parquet.
+
+Los filtros de la barra lateral (categóricos, rangos e integrante) se traducen a un solo
+predicado con parámetros; DuckDB lo empuja a la lectura de los Parquet (solo lee las
+columnas y grupos de filas necesarios) y resuelve KPIs y conteos de los gráficos en una
+sola pasada con ``GROUPING SETS``. Los resultados tienen la misma forma que los del cubo
+(``ResumenDashboard``) y de ``top5``, así que el dashboard puede usar cualquiera de los dos.
+La caché guarda las medidas en float64 y el dashboard las filtra compactadas a float32: los
+rangos comparan el valor redondeado a float32, así los límites enteros (p. ej. 2.01 m, que
+en float64 es 200.99999999999997 cm y en float32 201.0) dan las mismas filas en ambos.
+duckdb es opcional: sin él (o sin caché Parquet para todos los listados) no hay backend SQL.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from .cache_columnar import DIR_CACHE, huella_archivo, pq, ruta_cache
+from .cubo import MEDIDAS, ResumenDashboard
+from .estadisticas import COLUMNAS_TOP5
+from .filtros import COLUMNAS_FILTRO_CATEGORICAS, COLUMNAS_FILTRO_RANGO
+from .ingesta import grupo_desde_nombre
+from .memoria import COLUMNAS_FLOAT32
+from .nombres import normalizar_nombre
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - dependencia opcional
+    duckdb = None
+
+VISTA_ROSTER = 'roster'
+# Nombre normalizado como en ``normalizar_nombre``: sin tildes, minúsculas, espacios simples
+NOMBRE_NORMALIZADO = "regexp_replace(trim(strip_accents(lower(\"Nombre_Completo\"))), '\\s+', ' ', 'g')"
+# Dimensiones de los gráficos: (campo de ResumenDashboard, columna, expresión SQL)
+DIMENSIONES_GRAFICOS = [
+    ('conteo_edad', 'Edad', 'CAST("Edad" AS INTEGER)'),
+    ('conteo_rh', 'RH', '"RH"'),
+    ('top_cabello', 'Color_Cabello', '"Color_Cabello"'),
+    ('conteo_tallas', 'Talla_Zapato', 'TRY_CAST("Talla_Zapato" AS DOUBLE)'),
+    ('top_barrios', 'Barrio_Residencia', '"Barrio_Residencia"'),
+]
+TOP_GRAFICOS = 10
+
+
+def sql_disponible():
+    """``True`` si están duckdb y pyarrow (la caché Parquet)."""
+    return duckdb is not None and pq is not None
+
+
+def _literal(texto):
+    return "'" + str(texto).replace("'", "''") + "'"
+
+
+def _columna(nombre):
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+def _valor_rango(nombre):
+    """Columna de un filtro de rango con el valor que ve el dashboard (float32 si se compacta así)."""
+    if nombre in COLUMNAS_FLOAT32:
+        return f'CAST(CAST({_columna(nombre)} AS FLOAT) AS DOUBLE)'
+    return _columna(nombre)
+
+
+def construir_predicado(categoricos=None, rangos=None, integrante=None):
+    """``(sql, parámetros)`` del WHERE con todos los filtros de la barra lateral.
+
+    Siempre exige las cuatro medidas (la misma base que los KPIs en pandas). ``integrante``
+    sigue a ``IndiceNombres.posiciones``: coincidencia exacta del nombre normalizado o, si no
+    la hay, todos los nombres que empiezan por él. Solo las columnas conocidas de filtro
+    llegan al SQL; los valores van siempre como parámetros.
+    """
+    con_medidas = ' AND '.join(f'{_columna(col)} IS NOT NULL' for col in MEDIDAS)
+    condiciones = [con_medidas]
+    parametros = []
+    for col, valores in (categoricos or {}).items():
+        if valores and col in COLUMNAS_FILTRO_CATEGORICAS:
+            condiciones.append(f"{_columna(col)} IN ({', '.join('?' * len(valores))})")
+            parametros.extend(str(valor) for valor in valores)
+    for col, (minimo, maximo) in (rangos or {}).items():
+        if col in COLUMNAS_FILTRO_RANGO:
+            condiciones.append(f'{_valor_rango(col)} BETWEEN ? AND ?')
+            parametros.extend([float(minimo), float(maximo)])
+    if integrante is not None:
+        clave = normalizar_nombre(integrante)
+        condiciones.append(
+            f'CASE WHEN EXISTS (SELECT 1 FROM {VISTA_ROSTER} WHERE {con_medidas} AND {NOMBRE_NORMALIZADO} = ?) '
+            f'THEN {NOMBRE_NORMALIZADO} = ? ELSE starts_with({NOMBRE_NORMALIZADO}, ?) END'
+        )
+        parametros.extend([clave, clave, clave])
+    return ' AND '.join(condiciones), parametros
+
+
+class ConsultasSQL:
+    """KPIs, conteos y Top 5 del dashboard con DuckDB sobre uno o varios Parquet.
+
+    ``fuentes`` es una lista de ``(ruta_parquet, grupo)``; la vista ``roster`` las une y
+    agrega la columna ``Grupo``. Cada consulta usa su propio cursor, así que una instancia
+    se puede compartir entre sesiones (hilos).
+    """
+
+    def __init__(self, fuentes):
+        self._conexion = duckdb.connect()
+        partes = []
+        for ruta, grupo in fuentes:
+            # Si el Parquet ya trae 'Grupo' se reemplaza por el del nombre del archivo (como en cargar_grupos)
+            excluir = ' EXCLUDE ("Grupo")' if 'Grupo' in pq.read_schema(ruta).names else ''
+            partes.append(f'SELECT *{excluir}, {_literal(grupo)} AS "Grupo" FROM read_parquet({_literal(ruta)})')
+        self._conexion.execute(f"CREATE VIEW {VISTA_ROSTER} AS {' UNION ALL BY NAME '.join(partes)}")
+        self.columnas = [fila[0] for fila in self._conexion.execute(f'DESCRIBE {VISTA_ROSTER}').fetchall()]
+
+    @classmethod
+    def desde_listados(cls, archivos, dir_cache=DIR_CACHE):
+        """Instancia sobre la caché Parquet de ``archivos``; ``None`` si falta la de alguno."""
+        if not sql_disponible() or not archivos:
+            return None
+        fuentes = [(ruta_cache(huella_archivo(ruta), dir_cache), grupo_desde_nombre(ruta)) for ruta in archivos]
+        if not all(os.path.exists(ruta) for ruta, _ in fuentes):
+            return None
+        return cls(fuentes)
+
+    def _consultar(self, sql, parametros):
+        return self._conexion.cursor().execute(sql, parametros).df()
+
+    def resumen(self, categoricos=None, rangos=None, integrante=None):
+        """``ResumenDashboard`` de los filtros, con KPIs y conteos en una sola consulta."""
+        predicado, parametros = construir_predicado(categoricos, rangos, integrante)
+        dimensiones = [(campo, col, expresion) for campo, col, expresion in DIMENSIONES_GRAFICOS if col in self.columnas]
+        # Las medidas se renombran para no chocar con la dimensión Edad (entera)
+        base = [f'{expresion} AS {_columna(col)}' for _, col, expresion in dimensiones]
+        base += [f'{_columna(col)} AS {_columna("medida_" + col)}' for col in MEDIDAS]
+        salida = [f'GROUPING({_columna(col)}) AS {_columna("g_" + col)}' for _, col, _ in dimensiones]
+        salida += [_columna(col) for _, col, _ in dimensiones]
+        salida += ['count(*) AS "Conteo"']
+        salida += [f'avg({_columna("medida_" + col)}) AS {_columna("promedio_" + col)}' for col in MEDIDAS]
+        conjuntos = ['()'] + [f'({_columna(col)})' for _, col, _ in dimensiones]
+        filas = self._consultar(
+            f"WITH base AS (SELECT {', '.join(base)} FROM {VISTA_ROSTER} WHERE {predicado}) "
+            f"SELECT {', '.join(salida)} FROM base GROUP BY GROUPING SETS ({', '.join(conjuntos)})",
+            parametros,
+        )
+
+        # GROUPING(col) = 0 marca las filas del conjunto de esa columna; el total tiene todas en 1
+        marcas = filas[[f'g_{col}' for _, col, _ in dimensiones]].to_numpy() == 0
+        total = filas[~marcas.any(axis=1)]
+        conteo = int(total['Conteo'].iloc[0]) if len(total) else 0
+        promedios = [total[f'promedio_{col}'].iloc[0] if conteo else np.nan for col in MEDIDAS]
+
+        tablas = dict.fromkeys(campo for campo, _, _ in DIMENSIONES_GRAFICOS)
+        for i, (campo, col, _) in enumerate(dimensiones):
+            tabla = filas.loc[marcas[:, i], [col, 'Conteo']].dropna(subset=[col])
+            if campo.startswith('top_'):
+                tabla = tabla.sort_values(by=['Conteo', col], ascending=[False, True]).head(TOP_GRAFICOS)
+            else:
+                tabla = tabla.sort_values(by=col)
+            tablas[campo] = tabla.reset_index(drop=True)
+        return ResumenDashboard(conteo, *promedios, **tablas)
+
+    def top5(self, columna, categoricos=None, rangos=None, integrante=None):
+        """Las 5 filas filtradas con mayor ``columna``, con el formato de ``estadisticas.top5``."""
+        predicado, parametros = construir_predicado(categoricos, rangos, integrante)
+        # La Edad viene como DOUBLE en el Parquet (admite vacíos); en la base no los tiene
+        columnas = ', '.join('CAST("Edad" AS INTEGER) AS "Edad"' if col == 'Edad' else _columna(col)
+                             for col in COLUMNAS_TOP5[columna])
+        top = self._consultar(
+            f'SELECT {columnas} FROM {VISTA_ROSTER} WHERE {predicado} ORDER BY {_columna(columna)} DESC LIMIT 5',
+            parametros,
+        )
+        top.index = pd.RangeIndex(1, len(top) + 1)
+        return top
@@ -0,0 +1,244 @@
+"""Cubo de conteos y sumas para los KPIs y gráficos del dashboard.
+
+El cubo agrupa una sola vez el listado por las dimensiones categóricas y numéricas
+discretizadas; los datos de cada gráfico y los promedios de los KPIs se obtienen
+filtrando y reagrupando el cubo (mucho más pequeño que el listado). Los resúmenes ya
+calculados se guardan en una caché LRU acotada, con la combinación de filtros
+normalizada como clave.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacion import medir_etapa
+
+# Dimensiones categóricas de los filtros de la barra lateral (la talla solo se grafica)
+DIMENSIONES_FILTRO = ['Grupo', 'RH', 'Color_Cabello', 'Barrio_Residencia']
+MEDIDAS = ['Edad', 'Estatura', 'Peso', 'IMC']
+# Estatura discretizada como 2*piso + (1 si tiene decimales): conserva exactamente los
+# límites enteros del slider (>= mínimo y <= máximo)
+CLAVE_ESTATURA = 'Clave_Estatura'
+TAMANO_LRU = 128
+
+ResumenDashboard = namedtuple('ResumenDashboard', [
+    'total_estudiantes', 'edad_promedio', 'estatura_promedio', 'peso_promedio', 'imc_promedio',
+    'conteo_edad', 'conteo_rh', 'top_cabello', 'conteo_tallas', 'top_barrios',
+])
+
+
+class CacheLRU:
+    """Diccionario acotado con desalojo del elemento usado hace más tiempo (seguro entre hilos)."""
+
+    def __init__(self, maximo=TAMANO_LRU):
+        self.maximo = maximo
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave, calcular):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                return self._datos[clave]
+        valor = calcular()
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
+
+
+def clave_estatura(estatura):
+    """Discretiza la estatura para que ``e >= a`` equivalga a ``clave >= 2a`` y ``e <= b`` a ``clave <= 2b``."""
+    valores = np.asarray(estatura, dtype=float)
+    piso = np.floor(valores)
+    return 2 * piso + (valores != piso)
+
+
+def normalizar_filtros(categoricos=None, rangos=None):
+    """Tupla canónica (ordenada, sin filtros vacíos) para usar como clave de caché."""
+    cats = tuple(sorted((col, tuple(sorted(map(str, valores)))) for col, valores in (categoricos or {}).items() if valores))
+    rngs = tuple(sorted((col, (float(minimo), float(maximo))) for col, (minimo, maximo) in (rangos or {}).items()))
+    return cats, rngs
+
+
+def _agrupar(base, dimensiones):
+    """Conteo y sumas (columnas ``Suma_*`` presentes en ``base``) por combinación de ``dimensiones``."""
+    agregaciones = {col: (col, 'sum') for col in base.columns if col.startswith('Suma_')}
+    return (base.groupby(dimensiones, dropna=False, sort=False, observed=True)
+            .agg(Conteo=(dimensiones[0], 'size'), **agregaciones).reset_index())
+
+
+def _reagrupar(celdas, dimensiones):
+    """Suma las celdas de un cubo sobre un subconjunto de sus dimensiones."""
+    medidas = [col for col in celdas.columns if col == 'Conteo' or col.startswith('Suma_')]
+    return celdas.groupby(dimensiones, dropna=False, sort=False, observed=True)[medidas].sum().reset_index()
+
+
+def _sumar_celdas(partes, dimensiones):
+    """Suma celdas de varios cubos con las mismas dimensiones; descarta las que quedan vacías."""
+    if len(partes) == 1:
+        return partes[0]
+    celdas = (pd.concat(partes, ignore_index=True)
+              .groupby(dimensiones, dropna=False, sort=False, observed=True).sum().reset_index())
+    return celdas[celdas['Conteo'] > 0].reset_index(drop=True)
+
+
+class CuboDatos:
+    """Conteos y sumas de ``MEDIDAS`` por combinación de las dimensiones de filtro.
+
+    ``celdas`` agrupa por las dimensiones de los filtros (categóricas, Edad y la estatura
+    discretizada); de él salen los KPIs y los gráficos por Edad, RH, cabello y barrio. La
+    talla no es un filtro: multiplicaría las celdas, así que el gráfico de tallas sale de su
+    propio cubo de conteos (``celdas_tallas``). Como el filtro de estatura casi siempre cubre
+    todo el rango, cada cubo tiene además una versión sin la estatura, mucho más pequeña, que
+    se usa cuando ese filtro no restringe; sin ningún filtro las tallas salen del conteo
+    marginal por talla.
+    """
+
+    def __init__(self, df, tamano_lru=TAMANO_LRU):
+        categoricas = [col for col in DIMENSIONES_FILTRO if col in df.columns]
+        self.dimensiones = categoricas + ['Edad', CLAVE_ESTATURA]
+        base = df[categoricas + ['Edad']].assign(**{CLAVE_ESTATURA: clave_estatura(df['Estatura'])})
+        self.celdas = _agrupar(base.assign(**{f'Suma_{col}': df[col] for col in MEDIDAS}), self.dimensiones)
+        self.celdas_tallas = None
+        if 'Talla_Zapato' in df.columns:
+            self.celdas_tallas = _agrupar(base.assign(Talla_Zapato=df['Talla_Zapato']), self.dimensiones + ['Talla_Zapato'])
+        self._marginales()
+        self.cache = CacheLRU(tamano_lru)
+
+    def _marginales(self):
+        """Cubos sin la estatura, conteo por talla sin filtros y rango de cada dimensión de rango."""
+        sin_estatura = self.dimensiones[:-1]
+        self.celdas_sin_estatura = _reagrupar(self.celdas, sin_estatura)
+        self.celdas_tallas_sin_estatura = self.celdas_tallas_marginal = None
+        if self.celdas_tallas is not None:
+            self.celdas_tallas_sin_estatura = _reagrupar(self.celdas_tallas, sin_estatura + ['Talla_Zapato'])
+            self.celdas_tallas_marginal = _reagrupar(self.celdas_tallas, ['Talla_Zapato'])
+        self._rangos_celdas = {
+            col: (serie.min(), serie.max(), bool(serie.isna().any()))
+            for col, serie in [('Edad', self.celdas['Edad']), ('Estatura', self.celdas[CLAVE_ESTATURA] / 2)]
+        }
+
+    def _restringe(self, col, rangos):
+        """``True`` si el rango de ``col`` deja fuera alguna celda."""
+        if col not in rangos or not len(self.celdas):
+            return False
+        minimo, maximo = rangos[col]
+        valor_min, valor_max, con_vacios = self._rangos_celdas[col]
+        return con_vacios or valor_min < minimo or valor_max > maximo
+
+    def resumen(self, categoricos=None, rangos=None, registro=None):
+        """``ResumenDashboard`` de la combinación de filtros (servido desde la LRU si ya existe)."""
+        clave = normalizar_filtros(categoricos, rangos)
+        with medir_etapa(registro, 'resumen_cubo', len(self.celdas)) as medicion:
+            resumen = self.cache.obtener(clave, lambda: self._calcular(categoricos or {}, rangos or {}, registro))
+            medicion['filas_salida'] = resumen.total_estudiantes
+        return resumen
+
+    def con_delta(self, filas_quitadas=None, filas_agregadas=None):
+        """Nuevo cubo con las filas quitadas restadas y las agregadas sumadas (conteos y sumas son aditivos).
+
+        No modifica este cubo: otras sesiones pueden seguir leyéndolo mientras se publica el nuevo.
+        """
+        partes, partes_tallas = [self.celdas], [self.celdas_tallas]
+        for filas, signo in [(filas_quitadas, -1), (filas_agregadas, 1)]:
+            if filas is not None and len(filas):
+                delta = CuboDatos(filas, tamano_lru=0)
+                for destino, celdas in [(partes, delta.celdas), (partes_tallas, delta.celdas_tallas)]:
+                    if celdas is not None:
+                        medidas = [col for col in celdas.columns if col == 'Conteo' or col.startswith('Suma_')]
+                        destino.append(celdas.assign(**{col: signo * celdas[col] for col in medidas}))
+        nuevo = CuboDatos.__new__(CuboDatos)
+        nuevo.dimensiones = self.dimensiones
+        nuevo.cache = CacheLRU(self.cache.maximo)
+        nuevo.celdas = _sumar_celdas(partes, self.dimensiones)
+        nuevo.celdas_tallas = None if self.celdas_tallas is None else _sumar_celdas(partes_tallas, self.dimensiones + ['Talla_Zapato'])
+        nuevo._marginales()
+        return nuevo
+
+    @staticmethod
+    def _seleccionar(celdas, categoricos, rangos):
+        if celdas is None:
+            return None
+        mascara = np.ones(len(celdas), dtype=bool)
+        for col, valores in categoricos.items():
+            if valores and col in celdas.columns:
+                mascara &= celdas[col].isin(valores).to_numpy()
+        for col, (minimo, maximo) in rangos.items():
+            if col == 'Estatura':
+                serie, minimo, maximo = celdas[CLAVE_ESTATURA], 2 * minimo, 2 * maximo
+            else:
+                serie = celdas[col]
+            mascara &= ((serie >= minimo) & (serie <= maximo)).to_numpy()
+        return celdas[mascara]
+
+    def _calcular(self, categoricos, rangos, registro=None):
+        # El cubo más pequeño que resuelve exactamente los filtros que sí restringen
+        if self._restringe('Estatura', rangos):
+            celdas, tallas = self.celdas, self.celdas_tallas
+        else:
+            celdas, tallas = self.celdas_sin_estatura, self.celdas_tallas_sin_estatura
+            rangos = {col: rango for col, rango in rangos.items() if col != 'Estatura'}
+        if not any(categoricos.values()) and not any(self._restringe(col, rangos) for col in rangos):
+            return resumir_celdas(celdas, registro, celdas_tallas=self.celdas_tallas_marginal)
+        return resumir_celdas(self._seleccionar(celdas, categoricos, rangos), registro,
+                              celdas_tallas=self._seleccionar(tallas, categoricos, rangos))
+
+
+def resumen_desde_filas(df, registro=None):
+    """Resumen calculado directamente sobre unas pocas filas (p. ej. un integrante), sin LRU."""
+    cubo = CuboDatos(df, tamano_lru=0)
+    return resumir_celdas(cubo.celdas, registro, celdas_tallas=cubo.celdas_tallas)
+
+
+def _conteo_por(celdas, col):
+    return celdas.groupby(col, observed=True)['Conteo'].sum().reset_index(name='Conteo')
+
+
+def _conteo_tallas(celdas):
+    tallas = celdas[['Talla_Zapato', 'Conteo']].dropna(subset=['Talla_Zapato'])
+    # astype(object): la columna puede venir como categórica (ver memoria.compactar_roster)
+    tallas = tallas.assign(Talla_Zapato=pd.to_numeric(tallas['Talla_Zapato'].astype(object), errors='coerce')).dropna(subset=['Talla_Zapato'])
+    return _conteo_por(tallas, 'Talla_Zapato').sort_values(by='Talla_Zapato')
+
+
+def _top(celdas, col, n=10):
+    return _conteo_por(celdas, col).sort_values(by='Conteo', ascending=False).head(n)
+
+
+def resumir_celdas(celdas, registro=None, celdas_tallas=None):
+    """Agrega las celdas seleccionadas del cubo en KPIs y tablas para los gráficos.
+
+    El conteo por talla sale de ``celdas_tallas`` (las del cubo de tallas) si se pasan.
+    """
+    tallas = celdas if celdas_tallas is None else celdas_tallas
+    n = len(celdas)
+
+    def agregar(nombre, funcion, *args):
+        with medir_etapa(registro, f'agregacion_{nombre}', n) as medicion:
+            resultado = funcion(*args)
+            medicion['filas_salida'] = None if resultado is None else len(resultado)
+        return resultado
+
+    with medir_etapa(registro, 'agregacion_kpis', n):
+        total = int(celdas['Conteo'].sum())
+        promedios = [celdas[f'Suma_{col}'].sum() / total if total else np.nan for col in MEDIDAS]
+
+    return ResumenDashboard(
+        total, *promedios,
+        conteo_edad=agregar('edad', _conteo_por, celdas, 'Edad'),
+        conteo_rh=agregar('rh', _conteo_por, celdas, 'RH') if 'RH' in celdas.columns else None,
+        top_cabello=agregar('cabello', _top, celdas, 'Color_Cabello') if 'Color_Cabello' in celdas.columns else None,
+        conteo_tallas=agregar('tallas', _conteo_tallas, tallas) if 'Talla_Zapato' in tallas.columns else None,
+        top_barrios=agregar('barrios', _top, celdas, 'Barrio_Residencia') if 'Barrio_Residencia' in celdas.columns else None,
+    )
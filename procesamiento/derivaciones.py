@@ -0,0 +1,159 @@
+"""Columnas derivadas del listado de estudiantes (Edad, Estatura en cm, Peso, IMC).
+
+Todas las transformaciones operan sobre columnas completas (sin ``.apply`` por fila)
+y reproducen exactamente el resultado de las funciones originales del dashboard.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .fechas import parsear_fechas
+from .instrumentacion import medir_etapa
+
+REQUIRED_COLS = ['Codigo', 'Fecha_Nacimiento', 'Estatura', 'Peso', 'Nombre_Estudiante', 'Apellido_Estudiante']
+COLUMNAS_CATEGORICAS = ['Barrio_Residencia', 'Color_Cabello', 'RH', 'Talla_Zapato']
+
+# Límites y etiquetas de la clasificación de IMC (Punto 1.d)
+LIMITES_IMC = np.array([18.5, 25.0, 30.0])
+ETIQUETAS_IMC = np.array(['Bajo peso', 'Peso Normal', 'Sobrepeso', 'Obesidad'], dtype=object)
+ORDEN_IMC = ['Bajo peso', 'Peso Normal', 'Sobrepeso', 'Obesidad', 'Sin Datos']
+
+
+class ErrorColumnasFaltantes(ValueError):
+    """El archivo no trae alguna de las columnas esenciales (``REQUIRED_COLS``)."""
+
+    def __init__(self, faltantes):
+        self.faltantes = list(faltantes)
+        super().__init__(f"Faltan las columnas esenciales: {', '.join(self.faltantes)}")
+
+
+def clasificar_imc_vectorizado(imc):
+    """Clasifica el IMC por columna según los rangos estándar (Punto 1.d); NaN queda como 'Sin Datos'."""
+    valores = np.asarray(imc, dtype=float)
+    # searchsorted(side='right') deja cada valor en su intervalo [a, b); +inf cae en 'Obesidad'
+    posiciones = np.searchsorted(LIMITES_IMC, valores, side='right')
+    etiquetas = ETIQUETAS_IMC[np.minimum(posiciones, len(ETIQUETAS_IMC) - 1)]
+    etiquetas[np.isnan(valores)] = 'Sin Datos'
+    index = imc.index if isinstance(imc, pd.Series) else None
+    return pd.Series(etiquetas, index=index).astype(str)
+
+
+def calcular_edad(fechas, hoy=None):
+    """Edad cumplida a la fecha ``hoy`` a partir de una columna datetime (Punto 1.a).
+
+    Las fechas vacías (NaT) quedan como NaN. Igual que el cálculo original, el resultado
+    es entero si no hay fechas vacías y flotante en caso contrario.
+    """
+    hoy = hoy or date.today()
+    anios = fechas.dt.year.to_numpy(dtype=float)
+    meses = fechas.dt.month.to_numpy(dtype=float)
+    dias = fechas.dt.day.to_numpy(dtype=float)
+    # Todavía no cumple años si su (mes, día) es posterior al de hoy
+    sin_cumplir = (meses > hoy.month) | ((meses == hoy.month) & (dias > hoy.day))
+    edad = pd.Series(hoy.year - anios - sin_cumplir, index=fechas.index)
+    if len(edad) and not edad.isna().any():
+        return edad.astype('int64')
+    return edad
+
+
+def normalizar_numerico(serie, is_estatura=False):
+    """Convierte una columna a número aceptando coma decimal (Punto 1.b).
+
+    Con ``is_estatura=True`` los valores entre 1 y 3 se interpretan como metros y se
+    pasan a centímetros (Punto 2). Los valores no convertibles quedan como NaN.
+    """
+    if pd.api.types.is_bool_dtype(serie) or pd.api.types.is_numeric_dtype(serie):
+        valores = serie.astype(float)
+    else:
+        objetos = serie.astype(object)
+        tipo = pd.api.types.infer_dtype(objetos, skipna=True)
+        if tipo == 'string':
+            candidatos = objetos.str.replace(',', '.', regex=False)
+        elif tipo.startswith('mixed'):
+            # Columnas con texto y números mezclados: solo se reemplaza la coma en el texto
+            es_texto = objetos.map(lambda valor: isinstance(valor, str))
+            candidatos = objetos.where(~es_texto, objetos[es_texto].str.replace(',', '.', regex=False))
+        else:
+            candidatos = objetos
+        valores = pd.to_numeric(candidatos, errors='coerce').astype(float)
+        # Rescate fiel a float() para los pocos valores que to_numeric no reconoce (p. ej. '1_70')
+        pendientes = valores.isna() & objetos.notna()
+        if pendientes.any():
+            valores[pendientes] = candidatos[pendientes].map(_a_float)
+    if is_estatura:
+        en_metros = (valores > 1) & (valores < 3)
+        valores = valores.where(~en_metros, valores * 100)
+    return valores
+
+
+def _a_float(valor):
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def normalizar_columnas(df):
+    """Normaliza los encabezados preservando los guiones bajos y valida las columnas esenciales."""
+    df.columns = df.columns.str.strip().str.replace(' ', '_').str.replace('[^a-zA-Z0-9_]', '', regex=True)
+    missing_cols = [col for col in REQUIRED_COLS if col not in df.columns]
+    if missing_cols:
+        raise ErrorColumnasFaltantes(missing_cols)
+    return df
+
+
+def limpiar_categoricos(df):
+    """Limpieza y estandarización de categóricos (RH, Color_Cabello, etc.): primer valor sin espacios."""
+    for col in COLUMNAS_CATEGORICAS:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip().str.split(',').str[0].str.strip().replace('nan', np.nan)
+    return df
+
+
+def procesar_roster(df, hoy=None, registro=None):
+    """Aplica la limpieza y todas las columnas calculadas sobre el listado crudo.
+
+    Lanza ``ErrorColumnasFaltantes`` si faltan columnas esenciales. Si se pasa un
+    ``RegistroEtapas`` se mide cada etapa del procesamiento.
+    """
+    with medir_etapa(registro, 'normalizacion_columnas', len(df)) as medicion:
+        df = normalizar_columnas(df)
+        df = df.dropna(subset=['Codigo'])
+        medicion['filas_salida'] = len(df)
+
+    # Cálculo de Edad (Punto 1.a): formatos detectados por muestra, cada fecha distinta se
+    # interpreta una vez y el conteo de valores no interpretados por formato queda en attrs
+    with medir_etapa(registro, 'fechas', len(df)) as medicion:
+        df['Fecha_Nacimiento'], reporte_fechas = parsear_fechas(df['Fecha_Nacimiento'])
+        df.attrs['fechas'] = reporte_fechas
+        medicion['filas_salida'] = int(df['Fecha_Nacimiento'].notna().sum())
+    with medir_etapa(registro, 'edad', len(df)) as medicion:
+        df['Edad'] = calcular_edad(df['Fecha_Nacimiento'], hoy)
+        medicion['filas_salida'] = int(df['Edad'].notna().sum())
+
+    # Normalización de Estatura y Peso (Punto 2: Estatura a Centímetros)
+    with medir_etapa(registro, 'normalizacion_numerica', len(df)) as medicion:
+        df['Estatura_cm'] = normalizar_numerico(df['Estatura'], is_estatura=True)
+        df['Peso'] = normalizar_numerico(df['Peso'])
+        medicion['filas_salida'] = int((df['Estatura_cm'].notna() & df['Peso'].notna()).sum())
+
+    # Cálculo de IMC y Clasificación (Punto 1.c y 1.d)
+    with medir_etapa(registro, 'imc', len(df)) as medicion:
+        df['IMC'] = df['Peso'] / ((df['Estatura_cm'] / 100) ** 2)
+        df['Clasificación IMC'] = clasificar_imc_vectorizado(df['IMC'])
+        medicion['filas_salida'] = int(df['IMC'].notna().sum())
+
+    with medir_etapa(registro, 'limpieza_categoricos', len(df)) as medicion:
+        df = limpiar_categoricos(df)
+
+        # Renombrar columna de estatura final
+        df = df.rename(columns={'Estatura': 'Estatura_Original', 'Estatura_cm': 'Estatura'})
+
+        # Crear la columna de Nombre Completo para el filtro de Integrantes
+        df['Nombre_Completo'] = df['Nombre_Estudiante'].astype(str).str.strip() + ' ' + df['Apellido_Estudiante'].astype(str).str.strip()
+
+        # Eliminar columnas intermedias
+        df = df.drop(columns=['Estatura_Original'], errors='ignore')
+        medicion['filas_salida'] = len(df)
+    return df
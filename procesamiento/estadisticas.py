@@ -0,0 +1,249 @@
+"""Resumen estadístico de Estatura, Peso e IMC (Punto 12).
+
+``estadisticas_columnas`` calcula conteo, media, desviación (ddof=1), mínimo, máximo y
+cuartiles de varias columnas con una sola conversión a NumPy; los cuartiles usan selección
+(``np.quantile`` con interpolación lineal, igual que ``Series.describe``) en lugar de ordenar
+cada columna, y la tabla se arma directamente sin ``apply`` por fila.
+
+``AcumuladorEstadisticas`` es la versión en streaming: acumula por bloques o por grupos
+los momentos (fusión de Chan et al. para media y varianza) y un sketch de cuantiles tipo
+KLL, y dos acumuladores se combinan sin volver a recorrer los datos. ``acumular`` recorre un
+DataFrame por bloques de filas, así nunca se arma la matriz completa ni se ordena una columna
+entera.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_BIOMETRICAS = [('Estatura', 'cm'), ('Peso', 'kg'), ('IMC', '')]
+ORDEN_METRICAS = ['count', 'mean', 'std', 'min', 'max', '25%', '50%', '75%']
+CUANTILES = [0.25, 0.5, 0.75]
+# Capacidad del nivel más alto del sketch: el error de rango es del orden de 1/K_SKETCH
+K_SKETCH = 200
+# Bits aleatorios sorteados de una vez para elegir la mitad que sube en cada compactación
+LOTE_BITS = 4096
+# Filas por bloque al acumular un DataFrame en streaming
+TAMANO_BLOQUE_FILAS = 65_536
+# Columnas de las tablas Top 5 (Punto 11) según la medida por la que se ordena
+COLUMNAS_TOP5 = {
+    'Estatura': ['Nombre_Estudiante', 'Apellido_Estudiante', 'Estatura', 'Edad'],
+    'Peso': ['Nombre_Estudiante', 'Apellido_Estudiante', 'Peso', 'Estatura', 'IMC'],
+}
+
+EstadisticasColumna = namedtuple('EstadisticasColumna', ['count', 'mean', 'std', 'min', 'max', 'q25', 'q50', 'q75'])
+
+
+def _matriz(datos, columnas):
+    """Matriz float64 (filas x columnas, orden por columnas) a partir de un DataFrame o un arreglo."""
+    if isinstance(datos, pd.DataFrame):
+        valores = datos[columnas].to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        valores = np.asarray(datos, dtype=np.float64).reshape(-1, len(columnas))
+    return np.asfortranarray(valores)
+
+
+def _validos(columna):
+    return columna[~np.isnan(columna)]
+
+
+def _momentos(valores):
+    """``(conteo, media, m2, mínimo, máximo)`` de un vector sin NaN; m2 es la suma de cuadrados de las desviaciones."""
+    conteo = len(valores)
+    if not conteo:
+        return 0, np.nan, 0.0, np.nan, np.nan
+    media = valores.mean()
+    desvios = valores - media
+    return conteo, media, float(np.dot(desvios, desvios)), valores.min(), valores.max()
+
+
+def _desviacion(conteo, m2):
+    return np.sqrt(m2 / (conteo - 1)) if conteo > 1 else np.nan
+
+
+def estadisticas_columnas(df, columnas):
+    """``{columna: EstadisticasColumna}`` exactas (mismos valores que ``Series.describe``)."""
+    valores = _matriz(df, columnas)
+    estadisticas = {}
+    for i, col in enumerate(columnas):
+        validos = _validos(valores[:, i])
+        conteo, media, m2, minimo, maximo = _momentos(validos)
+        cuartiles = np.quantile(validos, CUANTILES) if conteo else [np.nan] * len(CUANTILES)
+        estadisticas[col] = EstadisticasColumna(conteo, media, _desviacion(conteo, m2), minimo, maximo, *cuartiles)
+    return estadisticas
+
+
+class SketchCuantiles:
+    """Sketch de cuantiles aproximados tipo KLL (compactores por nivel, fusionable).
+
+    Cada nivel ``h`` guarda elementos con peso ``2**h``. Cuando un nivel supera su capacidad
+    se ordena y la mitad de sus elementos (pares o impares, al azar) sube al nivel siguiente.
+    Los valores entran de a ``k`` por vez, así cada compactación ordena O(k) elementos; la
+    memoria es O(k) y dos sketches se combinan sumando nivel a nivel.
+    """
+
+    def __init__(self, k=K_SKETCH, semilla=0):
+        self.k = k
+        self.niveles = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+        self._bits = []
+        self._capacidades = self._calcular_capacidades()
+
+    def _calcular_capacidades(self):
+        # Los niveles bajos (de menor peso) tienen menos capacidad, como en KLL (c = 2/3)
+        altura = len(self.niveles)
+        return [max(2, int(np.ceil(self.k * (2 / 3) ** (altura - 1 - nivel)))) for nivel in range(altura)]
+
+    def _bit(self):
+        # Los bits aleatorios se sortean por lotes: una llamada al generador por compactación pesa
+        if not self._bits:
+            self._bits = self._rng.integers(2, size=LOTE_BITS).tolist()
+        return self._bits.pop()
+
+    def _compactar(self, completo=False):
+        # Sin un nivel nuevo, solo puede desbordarse el nivel que recibió elementos: la cascada se
+        # detiene en el primero que no se compacta. Un nivel nuevo reduce la capacidad de todos los
+        # de abajo, así que se vuelven a revisar todos desde el nivel 0.
+        nivel = 0
+        while nivel < len(self.niveles):
+            elementos = self.niveles[nivel]
+            if len(elementos) <= self._capacidades[nivel]:
+                if nivel > 0 and not completo:
+                    break
+                nivel += 1
+                continue
+            elementos.sort()
+            # Con cantidad impar el último elemento se queda en el nivel
+            pares = len(elementos) - len(elementos) % 2
+            promovidos = elementos[self._bit():pares:2]
+            self.niveles[nivel] = elementos[pares:]
+            if nivel + 1 == len(self.niveles):
+                self.niveles.append(promovidos)
+                self._capacidades = self._calcular_capacidades()
+                nivel, completo = 0, True
+                continue
+            self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], promovidos])
+            nivel += 1
+
+    def agregar(self, valores):
+        valores = _validos(np.asarray(valores, dtype=np.float64))
+        for inicio in range(0, len(valores), self.k):
+            self.niveles[0] = np.concatenate([self.niveles[0], valores[inicio:inicio + self.k]])
+            self._compactar()
+        return self
+
+    def combinar(self, otro):
+        for nivel, elementos in enumerate(otro.niveles):
+            if nivel == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            self.niveles[nivel] = np.concatenate([self.niveles[nivel], elementos])
+        self._capacidades = self._calcular_capacidades()
+        self._compactar(completo=True)
+        return self
+
+    def cuantiles(self, probabilidades):
+        """Cuantiles aproximados (el elemento cuyo rango ponderado alcanza ``p`` del total)."""
+        elementos = np.concatenate(self.niveles)
+        if not len(elementos):
+            return np.full(len(probabilidades), np.nan)
+        pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self.niveles)])
+        orden = np.argsort(elementos, kind='stable')
+        acumulado = np.cumsum(pesos[orden])
+        posiciones = np.searchsorted(acumulado, np.asarray(probabilidades) * acumulado[-1], side='left')
+        return elementos[orden][np.minimum(posiciones, len(elementos) - 1)]
+
+
+class AcumuladorEstadisticas:
+    """Estadísticas de varias columnas acumuladas por bloques y combinables entre grupos.
+
+    Conteo, media, desviación, mínimo y máximo son exactos (fusión de momentos de Chan et al.);
+    los cuartiles salen de un ``SketchCuantiles`` por columna y son aproximados.
+    """
+
+    def __init__(self, columnas, k=K_SKETCH, semilla=0):
+        self.columnas = list(columnas)
+        # Por columna: [conteo, media, m2, mínimo, máximo]
+        self.momentos = [[0, np.nan, 0.0, np.nan, np.nan] for _ in self.columnas]
+        self.sketches = [SketchCuantiles(k, semilla + i) for i in range(len(self.columnas))]
+
+    @staticmethod
+    def _fusionar(actual, conteo, media, m2, minimo, maximo):
+        if not conteo:
+            return actual
+        conteo_actual, media_actual, m2_actual, minimo_actual, maximo_actual = actual
+        if not conteo_actual:
+            return [conteo, media, m2, minimo, maximo]
+        total = conteo_actual + conteo
+        delta = media - media_actual
+        return [
+            total,
+            media_actual + delta * conteo / total,
+            m2_actual + m2 + delta ** 2 * conteo_actual * conteo / total,
+            min(minimo_actual, minimo),
+            max(maximo_actual, maximo),
+        ]
+
+    def agregar(self, datos):
+        """Incorpora un bloque (DataFrame con las columnas o matriz filas x columnas)."""
+        valores = _matriz(datos, self.columnas)
+        for i, sketch in enumerate(self.sketches):
+            validos = _validos(valores[:, i])
+            self.momentos[i] = self._fusionar(self.momentos[i], *_momentos(validos))
+            sketch.agregar(validos)
+        return self
+
+    def combinar(self, otro):
+        """Suma otro acumulador con las mismas columnas (p. ej. de otro grupo o proceso)."""
+        for i, (sketch, sketch_otro) in enumerate(zip(self.sketches, otro.sketches)):
+            self.momentos[i] = self._fusionar(self.momentos[i], *otro.momentos[i])
+            sketch.combinar(sketch_otro)
+        return self
+
+    def estadisticas(self):
+        """``{columna: EstadisticasColumna}`` con los cuartiles aproximados del sketch."""
+        estadisticas = {}
+        for i, col in enumerate(self.columnas):
+            conteo, media, m2, minimo, maximo = self.momentos[i]
+            estadisticas[col] = EstadisticasColumna(conteo, media, _desviacion(conteo, m2), minimo, maximo,
+                                                    *self.sketches[i].cuantiles(CUANTILES))
+        return estadisticas
+
+
+def acumular(df, columnas, tamano_bloque=TAMANO_BLOQUE_FILAS, k=K_SKETCH):
+    """``AcumuladorEstadisticas`` de ``columnas`` alimentado por bloques de ``tamano_bloque`` filas."""
+    acumulador = AcumuladorEstadisticas(columnas, k)
+    # Las columnas se extraen una sola vez; cada bloque es una vista de la matriz
+    valores = _matriz(df, columnas)
+    for inicio in range(0, len(valores), tamano_bloque):
+        acumulador.agregar(valores[inicio:inicio + tamano_bloque])
+    return acumulador
+
+
+def tabla_resumen(estadisticas, columnas_unidades=COLUMNAS_BIOMETRICAS):
+    """Tabla (Valor, Unidad) por métrica con el formato del resumen biométrico."""
+    datos = {}
+    for col, unidad in columnas_unidades:
+        valores = estadisticas[col]
+        datos[(col, 'Valor')] = [f'{valores.count}'] + [f'{valor:.1f}' for valor in valores[1:]]
+        datos[(col, 'Unidad')] = [unidad] * len(ORDEN_METRICAS)
+    return pd.DataFrame(datos, index=pd.Index(ORDEN_METRICAS, name='Métrica'))
+
+
+def resumen_biometrico(df, aproximado=False):
+    """Tabla combinada (Valor, Unidad) por métrica para Estatura, Peso e IMC.
+
+    Con ``aproximado=True`` los cuartiles salen del sketch de ``AcumuladorEstadisticas``.
+    """
+    columnas = [col for col, _ in COLUMNAS_BIOMETRICAS]
+    if aproximado:
+        estadisticas = acumular(df, columnas).estadisticas()
+    else:
+        estadisticas = estadisticas_columnas(df, columnas)
+    return tabla_resumen(estadisticas)
+
+
+def top5(df, columna):
+    """Las 5 filas con mayor ``columna`` (Estatura o Peso), numeradas desde 1 (Punto 11)."""
+    top = df.sort_values(by=columna, ascending=False).head(5)[COLUMNAS_TOP5[columna]].reset_index(drop=True)
+    top.index = top.index + 1
+    return top
@@ -0,0 +1,166 @@
+"""Interpretación de ``Fecha_Nacimiento`` con formatos mezclados (Punto 1.a).
+
+Los listados exportados mezclan fechas de Excel, seriales de Excel, ``dd/mm/aaaa``,
+``aaaa-mm-dd``, ``dd-mm-aaaa`` y texto (p. ej. "15 de marzo de 2005"). En lugar de la
+inferencia elemento por elemento de ``pd.to_datetime``:
+
+* los valores se factorizan: cada fecha distinta se interpreta una sola vez (las fechas
+  de nacimiento se repiten mucho) y el resultado se reparte a las filas con los códigos;
+* los formatos dominantes se detectan sobre una muestra de los valores distintos y cada
+  grupo se convierte de una vez con su formato explícito;
+* se informa por formato cuántos valores no se pudieron interpretar, en lugar de
+  convertirlos a NaT en silencio.
+"""
+import re
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+TAMANO_MUESTRA_FECHAS = 2000
+ORIGEN_EXCEL = pd.Timestamp('1899-12-30')
+# Seriales de Excel aceptados: del 1900-01-01 al 2099-12-31
+RANGO_SERIAL = (1, 73050)
+
+FORMATO_FECHA = 'fecha'      # celdas que ya son fecha (Excel)
+FORMATO_SERIAL = 'serial'    # número de días desde 1899-12-30
+FORMATO_TEXTO = 'texto'      # nombre del mes en español o cualquier otro texto
+FORMATO_VACIO = 'vacío'
+
+# (nombre, formato de strptime, expresión regular), en el orden en que se prueban si la muestra no decide
+FORMATOS_TEXTO = [
+    ('dd/mm/aaaa', '%d/%m/%Y', r'\d{1,2}/\d{1,2}/\d{4}'),
+    ('aaaa-mm-dd', '%Y-%m-%d', r'\d{4}-\d{1,2}-\d{1,2}'),
+    ('aaaa-mm-dd hh:mm:ss', '%Y-%m-%d %H:%M:%S', r'\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{2}:\d{2}'),
+    ('dd-mm-aaaa', '%d-%m-%Y', r'\d{1,2}-\d{1,2}-\d{4}'),
+]
+PATRON_SERIAL = r'\d{1,6}(?:\.\d+)?'
+
+MESES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+}
+PATRON_MES = re.compile(r'(\d{1,2})\s*(?:de\s+)?([a-záéíóú]+)\.?\s*(?:de\s+|del\s+)?(\d{4})', re.IGNORECASE)
+
+
+def _mes(nombre):
+    nombre = nombre.lower()
+    for completo, numero in MESES.items():
+        # Nombre completo o abreviatura de al menos 3 letras ("mar", "sept")
+        if len(nombre) >= 3 and completo.startswith(nombre):
+            return numero
+    return None
+
+
+def _fecha_en_texto(texto):
+    """'15 de marzo de 2005' o '15-mar-2005' -> Timestamp; ``NaT`` si no se reconoce."""
+    coincidencia = PATRON_MES.fullmatch(texto)
+    mes = coincidencia and _mes(coincidencia.group(2))
+    if mes:
+        try:
+            return pd.Timestamp(int(coincidencia.group(3)), mes, int(coincidencia.group(1)))
+        except ValueError:
+            return pd.NaT
+    return pd.to_datetime(texto, errors='coerce', dayfirst=True, format='mixed')
+
+
+def _desde_serial(numeros):
+    numeros = np.asarray(numeros, dtype=float)
+    validos = (numeros >= RANGO_SERIAL[0]) & (numeros <= RANGO_SERIAL[1])
+    dias = pd.to_timedelta(np.where(validos, numeros, np.nan), unit='D')
+    return (ORIGEN_EXCEL + dias).floor('D').to_numpy(dtype='datetime64[us]')
+
+
+def detectar_formatos(textos, tamano_muestra=TAMANO_MUESTRA_FECHAS):
+    """Nombres de ``FORMATOS_TEXTO`` (más 'serial') presentes en una muestra, del más frecuente al menos."""
+    muestra = textos if len(textos) <= tamano_muestra else textos.sample(tamano_muestra, random_state=0)
+    conteos = {nombre: int(muestra.str.fullmatch(patron).sum()) for nombre, _, patron in FORMATOS_TEXTO}
+    conteos[FORMATO_SERIAL] = int(muestra.str.fullmatch(PATRON_SERIAL).sum())
+    return [nombre for nombre, conteo in sorted(conteos.items(), key=lambda par: -par[1]) if conteo]
+
+
+def _interpretar_unicos(unicos):
+    """Fecha (datetime64[us], NaT si no se pudo) y formato de cada valor distinto."""
+    n = len(unicos)
+    fechas = np.full(n, np.datetime64('NaT'), dtype='datetime64[us]')
+    formatos = np.full(n, FORMATO_TEXTO, dtype=object)
+
+    if pd.api.types.infer_dtype(unicos, skipna=True) == 'string':
+        # Caso habitual de un CSV: todo es texto, sin revisar el tipo de cada valor
+        es_fecha = es_numero = np.zeros(n, dtype=bool)
+    else:
+        es_fecha = np.array([isinstance(valor, (datetime, date, np.datetime64)) for valor in unicos], dtype=bool)
+        es_numero = np.array([isinstance(valor, (int, float, np.number)) and not isinstance(valor, bool) for valor in unicos], dtype=bool)
+    if es_fecha.any():
+        fechas[es_fecha] = pd.to_datetime(pd.Series(unicos[es_fecha]), errors='coerce').to_numpy(dtype='datetime64[us]')
+        formatos[es_fecha] = FORMATO_FECHA
+    if es_numero.any():
+        fechas[es_numero] = _desde_serial(unicos[es_numero].astype(float))
+        formatos[es_numero] = FORMATO_SERIAL
+
+    posiciones = np.flatnonzero(~es_fecha & ~es_numero)
+    textos = pd.Series(unicos[posiciones], dtype=object).astype(str).str.strip()
+    # Celdas con solo espacios: vacías, no texto inválido
+    vacios = (textos == '').to_numpy(dtype=bool)
+    formatos[posiciones[vacios]] = FORMATO_VACIO
+    pendientes = ~vacios
+    formatos_texto = {nombre: (formato, patron) for nombre, formato, patron in FORMATOS_TEXTO}
+    formatos_texto[FORMATO_SERIAL] = (None, PATRON_SERIAL)
+    # Primero los formatos dominantes de la muestra; el resto solo sobre lo que quede pendiente
+    detectados = detectar_formatos(textos[pendientes]) if pendientes.any() else []
+    for nombre in detectados + [nombre for nombre in formatos_texto if nombre not in detectados]:
+        if not pendientes.any():
+            break
+        formato, patron = formatos_texto[nombre]
+        grupo = pendientes & textos.str.fullmatch(patron).to_numpy(dtype=bool)
+        if not grupo.any():
+            continue
+        if nombre == FORMATO_SERIAL:
+            convertidas = _desde_serial(textos[grupo].astype(float))
+        else:
+            convertidas = pd.to_datetime(textos[grupo], format=formato, errors='coerce').to_numpy(dtype='datetime64[us]')
+        fechas[posiciones[grupo]] = convertidas
+        formatos[posiciones[grupo]] = nombre
+        pendientes &= ~grupo
+
+    for i in np.flatnonzero(pendientes):
+        fechas[posiciones[i]] = _fecha_en_texto(textos.iloc[i]).to_datetime64()
+    return fechas, formatos
+
+
+def parsear_fechas(serie):
+    """Devuelve ``(fechas, reporte)``: la columna datetime y el conteo por formato.
+
+    ``reporte`` es una lista de dicts ``{'formato', 'valores', 'invalidos'}`` (serializable,
+    se guarda en ``df.attrs['fechas']``); las celdas vacías se informan como 'vacío'.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        vacios = int(serie.isna().sum())
+        reporte = [{'formato': FORMATO_FECHA, 'valores': len(serie) - vacios, 'invalidos': 0}]
+        return serie, combinar_reportes(reporte, [{'formato': FORMATO_VACIO, 'valores': vacios, 'invalidos': vacios}])
+
+    codigos, unicos = pd.factorize(serie.to_numpy(dtype=object))
+    fechas_unicas, formatos_unicos = _interpretar_unicos(np.asarray(unicos, dtype=object))
+    fechas = np.full(len(codigos), np.datetime64('NaT'), dtype='datetime64[us]')
+    con_valor = codigos >= 0
+    fechas[con_valor] = fechas_unicas[codigos[con_valor]]
+
+    # Conteo por formato sobre las filas (cada valor distinto pesa cuantas veces aparece)
+    apariciones = np.bincount(codigos[con_valor], minlength=len(unicos))
+    invalidos = apariciones * np.isnat(fechas_unicas)
+    tabla = pd.DataFrame({'formato': formatos_unicos, 'valores': apariciones, 'invalidos': invalidos})
+    reporte = tabla.groupby('formato', sort=False)[['valores', 'invalidos']].sum().reset_index().to_dict('records')
+    vacios = int((~con_valor).sum())
+    reporte.append({'formato': FORMATO_VACIO, 'valores': vacios, 'invalidos': vacios})
+    return pd.Series(fechas, index=serie.index, name=serie.name), combinar_reportes(reporte)
+
+
+def combinar_reportes(*reportes):
+    """Suma reportes de ``parsear_fechas`` (p. ej. de varios archivos o actualizaciones)."""
+    totales = {}
+    for reporte in reportes:
+        for fila in reporte or []:
+            actual = totales.setdefault(fila['formato'], {'formato': fila['formato'], 'valores': 0, 'invalidos': 0})
+            actual['valores'] += int(fila['valores'])
+            actual['invalidos'] += int(fila['invalidos'])
+    return [fila for fila in totales.values() if fila['valores']]
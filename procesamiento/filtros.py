@@ -0,0 +1,91 @@
+"""Índice de filtros de la barra lateral, construido una vez por conjunto de datos.
+
+Para cada columna categórica guarda las listas de posiciones (posting lists) de cada
+valor y para cada columna numérica el orden de sus filas, de modo que cualquier
+combinación de filtros se resuelve intersectando posiciones, sin copiar el DataFrame.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNAS_FILTRO_CATEGORICAS = ['Grupo', 'RH', 'Color_Cabello', 'Barrio_Residencia']
+COLUMNAS_FILTRO_RANGO = ['Edad', 'Estatura']
+
+
+class IndiceFiltros:
+    """Posting lists por valor categórico y posiciones ordenadas por columna numérica."""
+
+    def __init__(self, df, columnas_categoricas=COLUMNAS_FILTRO_CATEGORICAS, columnas_rango=COLUMNAS_FILTRO_RANGO):
+        self.n_filas = len(df)
+        self.postings = {}
+        self.ordenes = {}
+        for col in columnas_categoricas:
+            if col in df.columns:
+                self.postings[col] = _construir_postings(df[col])
+        for col in columnas_rango:
+            if col in df.columns:
+                valores = df[col].to_numpy(dtype=float)
+                orden = np.argsort(valores, kind='stable')
+                self.ordenes[col] = (orden, valores[orden])
+
+    def valores(self, col):
+        """Valores distintos (sin NaN) de una columna categórica, ordenados."""
+        return sorted(self.postings.get(col, {}))
+
+    def rango(self, col):
+        """``(mínimo, máximo)`` de una columna numérica (ignora NaN)."""
+        _, ordenados = self.ordenes[col]
+        validos = ordenados[~np.isnan(ordenados)]
+        return validos[0], validos[-1]
+
+    def _posiciones_categoricas(self, col, seleccion):
+        postings = self.postings.get(col, {})
+        partes = [postings[valor] for valor in seleccion if valor in postings]
+        return np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+
+    def _posiciones_rango(self, col, minimo, maximo):
+        orden, ordenados = self.ordenes[col]
+        inicio = np.searchsorted(ordenados, minimo, side='left')
+        fin = np.searchsorted(ordenados, maximo, side='right')
+        if inicio == 0 and fin == self.n_filas:
+            return None  # El rango cubre todas las filas: no restringe
+        return orden[inicio:fin]
+
+    def seleccionar(self, categoricos=None, rangos=None, posiciones=None):
+        """Posiciones (ordenadas) de las filas que cumplen todos los filtros.
+
+        ``categoricos`` mapea columna -> valores permitidos (vacío = sin filtro) y
+        ``rangos`` columna -> ``(mínimo, máximo)`` inclusivos. ``posiciones`` es una
+        selección ya resuelta por otro índice (p. ej. el de nombres) que también se
+        intersecta. Devuelve ``None`` si ningún filtro restringe, para que el llamador
+        use el DataFrame base tal cual.
+        """
+        selecciones = [] if posiciones is None else [posiciones]
+        for col, seleccion in (categoricos or {}).items():
+            if seleccion:
+                selecciones.append(self._posiciones_categoricas(col, seleccion))
+        for col, (minimo, maximo) in (rangos or {}).items():
+            if col in self.ordenes:
+                posiciones = self._posiciones_rango(col, minimo, maximo)
+                if posiciones is not None:
+                    selecciones.append(posiciones)
+        if not selecciones:
+            return None
+
+        # Se parte de la selección más pequeña y se descartan candidatos con cada máscara
+        selecciones.sort(key=len)
+        candidatos = np.sort(selecciones[0])
+        mascara = np.zeros(self.n_filas, dtype=bool)
+        for posiciones in selecciones[1:]:
+            if not len(candidatos):
+                break
+            mascara[posiciones] = True
+            candidatos = candidatos[mascara[candidatos]]
+            mascara[posiciones] = False
+        return candidatos
+
+
+def _construir_postings(serie):
+    codigos, valores = pd.factorize(serie, use_na_sentinel=True)
+    orden = np.argsort(codigos, kind='stable')
+    limites = np.searchsorted(codigos[orden], np.arange(len(valores) + 1))
+    return {valor: orden[limites[i]:limites[i + 1]] for i, valor in enumerate(valores)}
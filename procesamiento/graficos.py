@@ -0,0 +1,101 @@
+"""Figuras del dashboard cuyo modo de dibujo depende del volumen de datos.
+
+El gráfico Estatura vs Peso se entrega como SVG interactivo para grupos pequeños, como
+WebGL para volúmenes medianos y, para volúmenes grandes, como un mapa de calor 2D
+agregado en el servidor (coloreado por la Clasificación IMC dominante en cada celda)
+con el detalle al pasar el cursor limitado a una muestra de puntos.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .derivaciones import ORDEN_IMC
+
+UMBRAL_WEBGL = 2_000
+UMBRAL_DENSIDAD = 100_000
+BINS_DENSIDAD = 80
+TAMANO_MUESTRA_HOVER = 1_000
+COLORES_IMC = dict(zip(ORDEN_IMC, px.colors.qualitative.Plotly))
+
+MODO_SVG = 'svg'
+MODO_WEBGL = 'webgl'
+MODO_DENSIDAD = 'densidad'
+
+ETIQUETAS_EJES = {'Estatura': 'Estatura (cm)', 'Peso': 'Peso (kg)'}
+HOVER_DATA = ['Nombre_Estudiante', 'Apellido_Estudiante', 'IMC']
+
+
+def modo_dispersion(n_filas, umbral_webgl=UMBRAL_WEBGL, umbral_densidad=UMBRAL_DENSIDAD):
+    """Elige el modo de dibujo según la cantidad de filas."""
+    if n_filas <= umbral_webgl:
+        return MODO_SVG
+    if n_filas <= umbral_densidad:
+        return MODO_WEBGL
+    return MODO_DENSIDAD
+
+
+def figura_estatura_peso(df, umbral_webgl=UMBRAL_WEBGL, umbral_densidad=UMBRAL_DENSIDAD):
+    """Devuelve ``(figura, modo)`` del gráfico Estatura vs Peso (Punto 9)."""
+    modo = modo_dispersion(len(df), umbral_webgl, umbral_densidad)
+    if modo == MODO_DENSIDAD:
+        return _figura_densidad(df), modo
+    fig = px.scatter(df,
+                     x='Estatura',
+                     y='Peso',
+                     color='Clasificación IMC',
+                     title='Estatura vs. Peso',
+                     labels=ETIQUETAS_EJES,
+                     category_orders={"Clasificación IMC": ORDEN_IMC},
+                     hover_data=HOVER_DATA,
+                     render_mode=modo)
+    return fig, modo
+
+
+def _figura_densidad(df, bins=BINS_DENSIDAD, tamano_muestra=TAMANO_MUESTRA_HOVER):
+    x = df['Estatura'].to_numpy(dtype=float)
+    y = df['Peso'].to_numpy(dtype=float)
+    codigo_clase = pd.Categorical(df['Clasificación IMC'], categories=ORDEN_IMC).codes.astype(np.int64)
+    codigo_clase[codigo_clase < 0] = ORDEN_IMC.index('Sin Datos')
+
+    bordes_x = np.linspace(np.nanmin(x), np.nanmax(x), bins + 1)
+    bordes_y = np.linspace(np.nanmin(y), np.nanmax(y), bins + 1)
+    celda_x = np.clip(np.searchsorted(bordes_x, x, side='right') - 1, 0, bins - 1)
+    celda_y = np.clip(np.searchsorted(bordes_y, y, side='right') - 1, 0, bins - 1)
+
+    # Conteo por (celda, clase) en una sola pasada y clase dominante por celda
+    n_clases = len(ORDEN_IMC)
+    celda = celda_y * bins + celda_x
+    conteos = np.bincount(celda * n_clases + codigo_clase, minlength=bins * bins * n_clases)
+    conteos = conteos.reshape(bins, bins, n_clases)
+    total = conteos.sum(axis=2)
+    dominante = np.where(total > 0, conteos.argmax(axis=2), np.nan)
+
+    escala = []
+    for i, clase in enumerate(ORDEN_IMC):
+        escala += [(i / n_clases, COLORES_IMC[clase]), ((i + 1) / n_clases, COLORES_IMC[clase])]
+    etiquetas = np.where(np.isnan(dominante), '', np.array(ORDEN_IMC, dtype=object)[np.nan_to_num(dominante).astype(int)])
+
+    fig = go.Figure(go.Heatmap(
+        x=(bordes_x[:-1] + bordes_x[1:]) / 2,
+        y=(bordes_y[:-1] + bordes_y[1:]) / 2,
+        z=dominante,
+        zmin=-0.5, zmax=n_clases - 0.5,
+        colorscale=escala,
+        customdata=np.dstack([total, etiquetas]),
+        hovertemplate='Estatura: %{x:.1f} cm<br>Peso: %{y:.1f} kg<br>Estudiantes: %{customdata[0]}'
+                      '<br>IMC dominante: %{customdata[1]}<extra></extra>',
+        colorbar=dict(title='Clasificación IMC', tickvals=list(range(n_clases)), ticktext=ORDEN_IMC),
+    ))
+
+    # Detalle individual solo para una muestra de estudiantes
+    muestra = df.sample(min(tamano_muestra, len(df)), random_state=0)
+    fig.add_trace(go.Scattergl(
+        x=muestra['Estatura'], y=muestra['Peso'], mode='markers', name='Muestra',
+        marker=dict(size=3, color='rgba(0,0,0,0.35)'),
+        customdata=muestra[HOVER_DATA].to_numpy(),
+        hovertemplate='%{customdata[0]} %{customdata[1]}<br>IMC: %{customdata[2]:.1f}<extra></extra>',
+    ))
+    fig.update_layout(title=f'Estatura vs. Peso (densidad de {len(df):,} estudiantes)',
+                      xaxis_title=ETIQUETAS_EJES['Estatura'], yaxis_title=ETIQUETAS_EJES['Peso'])
+    return fig
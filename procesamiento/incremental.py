@@ -0,0 +1,342 @@
+"""Recarga incremental del listado cuando el archivo cambia (p. ej. nuevas matrículas).
+
+``RosterIncremental`` guarda el listado procesado, la base de KPIs y el cubo de agregados
+de un archivo. Al detectar un cambio (tamaño o fecha de modificación) solo las filas nuevas
+o modificadas pasan por ``procesar_roster``:
+
+* Si el archivo es un CSV al que solo se le agregaron líneas al final (el contenido ya
+  leído no cambió), se parsean únicamente los bytes nuevos.
+* En cualquier otro caso se relee el archivo crudo y se comparan las filas por ``Codigo``
+  (con el número de aparición para tolerar códigos repetidos) mediante un hash por fila.
+
+El cubo se actualiza restando las filas viejas y sumando las nuevas, sin reagrupar todo el
+listado. Cada actualización publica un ``EstadoRoster`` nuevo de una sola vez, así las
+sesiones que leen el estado anterior no ven mezclas de versiones.
+
+Las claves y hashes de fila se guardan junto a la entrada Parquet de la caché (misma huella,
+sufijo ``.filas``): con la caché completa el arranque no vuelve a parsear el archivo. Después
+de cada actualización el listado y sus hashes se escriben bajo la huella del archivo nuevo y
+se borran las entradas de la huella anterior. En disco el listado queda sin compactar (float64,
+como lo escribe ``cargar_roster`` y lo leen el modo por lotes y DuckDB): la versión nueva se
+arma con la entrada anterior y las filas procesadas de cada actualización, no con el estado
+compacto en memoria. En un CSV el hash del contenido se acumula con
+los bytes agregados, así la huella nueva no vuelve a leer el archivo completo.
+"""
+import functools
+import hashlib
+import io
+import os
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+from .cache_columnar import DIR_CACHE, borrar_cache, guardar_cache, huella_archivo, huella_desde_hash, leer_cache
+from .carga import ORIGEN_CACHE
+from .cubo import CuboDatos
+from .derivaciones import normalizar_columnas, procesar_roster
+from .fechas import combinar_reportes, parsear_fechas
+from .instrumentacion import RegistroEtapas, medir_etapa
+from .lectura import detectar_formato, leer_roster
+from .memoria import compactar_roster, memoria_mb
+
+COLUMNAS_KPI = ['Edad', 'Estatura', 'Peso', 'IMC']
+SUFIJO_FILAS = '.filas'
+
+EstadoRoster = namedtuple('EstadoRoster', ['df', 'df_base', 'cubo', 'version'])
+CambiosRoster = namedtuple('CambiosRoster', ['nuevos', 'modificados', 'eliminados', 'solo_agregadas'])
+
+
+def _preparar_crudo(df_crudo):
+    """Encabezados normalizados y sin filas sin ``Codigo`` (igual que el inicio de ``procesar_roster``)."""
+    return normalizar_columnas(df_crudo).dropna(subset=['Codigo'])
+
+
+def _claves(df_crudo, apariciones_previas=None):
+    """Clave ``(Codigo, n.º de aparición)`` de cada fila; ``apariciones_previas`` continúa la numeración."""
+    codigos = df_crudo['Codigo'].astype(str).str.strip()
+    aparicion = codigos.groupby(codigos, sort=False).cumcount()
+    if apariciones_previas is not None:
+        aparicion = aparicion + codigos.map(apariciones_previas).fillna(0).astype('int64')
+    return pd.MultiIndex.from_arrays([codigos.to_numpy(), aparicion.to_numpy()], names=['Codigo', 'Aparicion'])
+
+
+def _hash_filas(df_crudo, claves):
+    """Hash del contenido crudo de cada fila (como texto, para no depender del tipo inferido)."""
+    hashes = pd.util.hash_pandas_object(df_crudo.astype(str), index=False)
+    return pd.Series(hashes.to_numpy(), index=claves)
+
+
+def _tabla_filas(hashes, etiquetas, filas_crudas):
+    """Claves, hash y etiqueta de cada fila cruda, para guardarlas en la caché."""
+    tabla = hashes.index.to_frame(index=False).assign(Hash=hashes.to_numpy(), Etiqueta=etiquetas.to_numpy())
+    tabla.attrs['filas_crudas'] = filas_crudas
+    return tabla
+
+
+def _desde_tabla_filas(tabla):
+    """``(hashes, etiquetas, filas_crudas)`` a partir de ``_tabla_filas`` leída de la caché."""
+    claves = pd.MultiIndex.from_arrays(
+        [tabla['Codigo'].to_numpy(dtype=object), tabla['Aparicion'].to_numpy()], names=['Codigo', 'Aparicion'],
+    )
+    hashes = pd.Series(tabla['Hash'].to_numpy(), index=claves)
+    etiquetas = pd.Series(tabla['Etiqueta'].to_numpy(), index=claves)
+    return hashes, etiquetas, int(tabla.attrs['filas_crudas'])
+
+
+def _combinar(df, etiquetas_previas, etiquetas_actuales, nuevos):
+    """Filas sin cambios de ``df`` reubicadas en su posición actual del archivo, más las nuevas."""
+    conservados = df.loc[etiquetas_previas]
+    conservados.index = etiquetas_actuales
+    return pd.concat([conservados, nuevos]).sort_index()
+
+
+def _base_kpi(df):
+    return compactar_roster(df.dropna(subset=COLUMNAS_KPI))
+
+
+class RosterIncremental:
+    """Listado procesado de un archivo que se actualiza procesando solo las filas que cambian."""
+
+    def __init__(self, ruta, dir_cache=DIR_CACHE):
+        self.ruta = ruta
+        self.dir_cache = dir_cache
+        self._lock = threading.Lock()
+        registro = RegistroEtapas()
+        estado_archivo = os.stat(ruta)
+        with medir_etapa(registro, 'huella_archivo'):
+            self.formato = detectar_formato(ruta)
+            self._registrar_bytes(estado_archivo)
+            self.huella = self._huella_actual()
+        with medir_etapa(registro, 'lectura_cache') as medicion:
+            df = leer_cache(self.huella, dir_cache)
+            filas = leer_cache(self.huella, dir_cache, SUFIJO_FILAS) if df is not None else None
+            medicion['filas_salida'] = None if df is None else len(df)
+        self.origen = ORIGEN_CACHE
+        # Cambios aún no escritos sobre la entrada en disco; None si no hay entrada que actualizar
+        self._pendientes = [] if df is not None else None
+
+        if filas is not None and 'filas_crudas' in filas.attrs:
+            self._hashes, self._etiquetas, self._filas_crudas = _desde_tabla_filas(filas)
+        else:
+            # Sin caché (o sin los hashes de fila): se lee el archivo crudo una vez
+            with medir_etapa(registro, 'lectura') as medicion:
+                df_crudo, self.formato = leer_roster(ruta, self.formato)
+                medicion['filas_salida'] = len(df_crudo)
+            if df is None:
+                self.origen = self.formato
+                df = procesar_roster(df_crudo.copy(), registro=registro)
+                with medir_etapa(registro, 'escritura_cache', len(df)):
+                    self._pendientes = [] if guardar_cache(df, self.huella, dir_cache) else None
+            with medir_etapa(registro, 'hash_filas', len(df_crudo)):
+                self._filas_crudas = len(df_crudo)
+                crudo = _preparar_crudo(df_crudo)
+                claves = _claves(crudo)
+                self._hashes = _hash_filas(crudo, claves)
+                self._etiquetas = pd.Series(crudo.index.to_numpy(), index=claves)
+                guardar_cache(_tabla_filas(self._hashes, self._etiquetas, self._filas_crudas),
+                              self.huella, dir_cache, SUFIJO_FILAS)
+
+        with medir_etapa(registro, 'compactacion', len(df)):
+            self.memoria = {'antes_mb': memoria_mb(df)}
+            df = compactar_roster(df)
+            self.memoria['despues_mb'] = memoria_mb(df)
+        with medir_etapa(registro, 'cubo', len(df)):
+            df_base = _base_kpi(df)
+            self._publicar(df, df_base, CuboDatos(df_base), 0, df.attrs.get('fechas'))
+        self.etapas = registro.etapas
+        self.etapas_actualizacion = []
+
+    def _registrar_bytes(self, estado_archivo, consumidos=None, digest=None):
+        """Firma del archivo y bytes ya incorporados (con su hash) para detectar agregados al final.
+
+        Con ``digest`` (el hash acumulado de los ``consumidos`` bytes, que terminan en salto de
+        línea) no se relee el archivo.
+        """
+        self._firma = (estado_archivo.st_size, estado_archivo.st_mtime_ns)
+        if self.formato.tipo != 'csv':
+            self._bytes, self._digest, self._encabezado = 0, None, b''
+            return
+        if digest is not None:
+            self._bytes, self._digest, self._termina_en_salto = consumidos, digest, True
+            return
+        with open(self.ruta, 'rb') as archivo:
+            contenido = archivo.read() if consumidos is None else archivo.read(consumidos)
+        self._bytes = len(contenido)
+        self._digest = hashlib.sha256(contenido)
+        self._encabezado = contenido.split(b'\n', 1)[0] + b'\n'
+        self._termina_en_salto = contenido.endswith(b'\n')
+
+    def _huella_actual(self):
+        """Huella de caché del archivo tal como se incorporó; en CSV sale del hash acumulado."""
+        if self._digest is None:
+            return huella_archivo(self.ruta)
+        return huella_desde_hash(self.ruta, *self._firma, self._digest.hexdigest())
+
+    def _publicar(self, df, df_base, cubo, version, fechas):
+        df.attrs['huella'] = df_base.attrs['huella'] = f'{self.huella}:{version}'
+        df.attrs['fechas'] = df_base.attrs['fechas'] = fechas
+        self.estado = EstadoRoster(df, df_base, cubo, version)
+
+    def hay_cambios(self):
+        """``True`` si el tamaño o la fecha de modificación del archivo cambiaron (solo un ``stat``)."""
+        try:
+            estado_archivo = os.stat(self.ruta)
+        except OSError:
+            # Archivo reemplazado en este momento (p. ej. guardado atómico): se revisa en la próxima llamada
+            return False
+        return (estado_archivo.st_size, estado_archivo.st_mtime_ns) != self._firma
+
+    def _leer_agregadas(self, estado_archivo):
+        """``(filas, bytes consumidos, hash acumulado)`` de las líneas agregadas al final de un CSV.
+
+        ``None`` si el contenido ya leído cambió.
+        """
+        if self.formato.tipo != 'csv' or not self._termina_en_salto or estado_archivo.st_size <= self._bytes:
+            return None
+        with open(self.ruta, 'rb') as archivo:
+            if hashlib.sha256(archivo.read(self._bytes)).digest() != self._digest.digest():
+                return None
+            cola = archivo.read()
+        # Una última línea a medio escribir se deja para la próxima actualización
+        cola = cola[:cola.rfind(b'\n') + 1]
+        if not cola.strip():
+            return pd.DataFrame(), self._bytes, self._digest
+        digest = self._digest.copy()
+        digest.update(cola)
+        df_cola = pd.read_csv(io.BytesIO(self._encabezado + cola), sep=self.formato.sep, encoding=self.formato.encoding)
+        df_cola.index = df_cola.index + self._filas_crudas
+        return df_cola, self._bytes + len(cola), digest
+
+    def actualizar(self):
+        """Incorpora los cambios del archivo y devuelve ``CambiosRoster`` o ``None`` si no cambió.
+
+        Si la lectura o el procesamiento fallan (p. ej. el archivo se está escribiendo) se
+        lanza la excepción y el estado publicado no cambia; se reintenta en la próxima llamada.
+        Las mediciones de la última actualización quedan en ``etapas_actualizacion``.
+        """
+        if not self.hay_cambios():
+            return None
+        with self._lock:
+            estado_archivo = os.stat(self.ruta)
+            if (estado_archivo.st_size, estado_archivo.st_mtime_ns) == self._firma:
+                return None
+            registro = RegistroEtapas()
+            with medir_etapa(registro, 'incremental_lectura') as medicion:
+                agregadas = self._leer_agregadas(estado_archivo)
+                medicion['filas_salida'] = None if agregadas is None else len(agregadas[0])
+            if agregadas is not None:
+                cambios = self._aplicar_agregadas(*agregadas, estado_archivo, registro)
+            else:
+                cambios = self._aplicar_diferencias(estado_archivo, registro)
+            if cambios.nuevos or cambios.modificados or cambios.eliminados:
+                self._guardar_cache(registro)
+            self.etapas_actualizacion = registro.etapas
+            return cambios
+
+    def _guardar_cache(self, registro):
+        """Escribe el listado actualizado y sus hashes de fila bajo la huella del archivo actual.
+
+        Solo si lo incorporado es exactamente el archivo: sin una última línea a medio escribir
+        pendiente y sin cambios posteriores a la lectura (los verá la próxima actualización).
+        El listado sale de la entrada anterior (sin compactar) con los cambios pendientes
+        aplicados en orden. Las entradas de la huella anterior se borran: ya no corresponden
+        a ningún archivo.
+        """
+        if self._pendientes is None or (self.formato.tipo == 'csv' and self._bytes != self._firma[0]):
+            return
+        with medir_etapa(registro, 'escritura_cache', len(self.estado.df)):
+            estado_archivo = os.stat(self.ruta)
+            if (estado_archivo.st_size, estado_archivo.st_mtime_ns) != self._firma:
+                return
+            huella = self._huella_actual()
+            if huella == self.huella:
+                self._pendientes = []
+                return
+            df = leer_cache(self.huella, self.dir_cache)
+            if df is None:
+                # La entrada anterior desapareció: ya no hay base que actualizar hasta reiniciar
+                self._pendientes = None
+                return
+            for combinar in self._pendientes:
+                df = combinar(df)
+            df.attrs = {'fechas': self.estado.df.attrs.get('fechas')}
+            guardado = guardar_cache(df, huella, self.dir_cache) and guardar_cache(
+                _tabla_filas(self._hashes, self._etiquetas, self._filas_crudas), huella, self.dir_cache, SUFIJO_FILAS,
+            )
+            if not guardado:
+                borrar_cache(huella, self.dir_cache)
+                return
+            self._pendientes = []
+            anterior, self.huella = self.huella, huella
+            borrar_cache(anterior, self.dir_cache)
+            borrar_cache(anterior, self.dir_cache, SUFIJO_FILAS)
+
+    def _aplicar_agregadas(self, df_cola, consumidos, digest, estado_archivo, registro):
+        estado = self.estado
+        if df_cola.empty:
+            self._registrar_bytes(estado_archivo, consumidos, digest)
+            return CambiosRoster(0, 0, 0, True)
+        filas_cola = len(df_cola)
+        crudo = _preparar_crudo(df_cola)
+        apariciones = self._hashes.index.get_level_values('Codigo').value_counts()
+        claves = _claves(crudo, apariciones)
+        with medir_etapa(registro, 'incremental_procesamiento', len(crudo)) as medicion:
+            procesados = procesar_roster(crudo.copy())
+            nuevos = compactar_roster(procesados)
+            medicion['filas_salida'] = len(nuevos)
+        with medir_etapa(registro, 'incremental_cubo', len(nuevos)):
+            nuevos_base = _base_kpi(nuevos)
+            df = compactar_roster(pd.concat([estado.df, nuevos]))
+            df_base = compactar_roster(pd.concat([estado.df_base, nuevos_base]))
+            cubo = estado.cubo.con_delta(filas_agregadas=nuevos_base)
+
+        self._hashes = pd.concat([self._hashes, _hash_filas(crudo, claves)])
+        self._etiquetas = pd.concat([self._etiquetas, pd.Series(crudo.index.to_numpy(), index=claves)])
+        self._filas_crudas += filas_cola
+        self._registrar_bytes(estado_archivo, consumidos, digest)
+        if self._pendientes is not None:
+            self._pendientes.append(lambda previo: pd.concat([previo, procesados]))
+        fechas = combinar_reportes(estado.df.attrs.get('fechas'), nuevos.attrs.get('fechas'))
+        self._publicar(df, df_base, cubo, estado.version + 1, fechas)
+        return CambiosRoster(len(crudo), 0, 0, True)
+
+    def _aplicar_diferencias(self, estado_archivo, registro):
+        estado = self.estado
+        with medir_etapa(registro, 'incremental_relectura') as medicion:
+            df_crudo, _ = leer_roster(self.ruta, self.formato)
+            filas_crudas = len(df_crudo)
+            crudo = _preparar_crudo(df_crudo)
+            claves = _claves(crudo)
+            hashes = _hash_filas(crudo, claves)
+            etiquetas = pd.Series(crudo.index.to_numpy(), index=claves)
+            medicion['filas_salida'] = len(crudo)
+
+        comunes = hashes.index.intersection(self._hashes.index)
+        iguales = comunes[hashes.loc[comunes].to_numpy() == self._hashes.loc[comunes].to_numpy()]
+        cambiadas = hashes.index.difference(iguales)
+        quitadas = self._hashes.index.difference(iguales)
+        modificados = len(cambiadas.intersection(comunes))
+
+        with medir_etapa(registro, 'incremental_procesamiento', len(cambiadas)) as medicion:
+            nuevos = procesar_roster(crudo.loc[etiquetas.loc[cambiadas].to_numpy()].copy())
+            medicion['filas_salida'] = len(nuevos)
+        with medir_etapa(registro, 'incremental_cubo', len(nuevos)):
+            # Las filas sin cambios conservan su resultado, reubicadas en su posición actual del archivo
+            etiquetas_previas, etiquetas_actuales = self._etiquetas.loc[iguales].to_numpy(), etiquetas.loc[iguales].to_numpy()
+            df = compactar_roster(_combinar(estado.df, etiquetas_previas, etiquetas_actuales, nuevos))
+            filas_quitadas = estado.df_base.loc[estado.df_base.index.intersection(self._etiquetas.loc[quitadas].to_numpy())]
+            cubo = estado.cubo.con_delta(filas_quitadas=filas_quitadas, filas_agregadas=_base_kpi(nuevos))
+            df_base = _base_kpi(df)
+
+        self._hashes, self._etiquetas, self._filas_crudas = hashes, etiquetas, filas_crudas
+        self._registrar_bytes(estado_archivo)
+        if self._pendientes is not None:
+            self._pendientes.append(functools.partial(
+                _combinar, etiquetas_previas=etiquetas_previas, etiquetas_actuales=etiquetas_actuales, nuevos=nuevos,
+            ))
+        # Las filas quitadas no guardan su formato de fecha: el reporte se rehace sobre el archivo
+        # (cada fecha distinta se interpreta una sola vez)
+        _, fechas = parsear_fechas(crudo['Fecha_Nacimiento'])
+        self._publicar(df, df_base, cubo, estado.version + 1, fechas)
+        return CambiosRoster(len(cambiadas) - modificados, modificados, len(quitadas) - modificados, False)
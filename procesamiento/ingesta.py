@@ -0,0 +1,91 @@
+"""Ingesta de varios listados de grupo (directorio o patrón glob) en paralelo.
+
+Cada archivo se carga con ``cargar_roster`` en un proceso del pool, de modo que su
+caché Parquet es independiente: si cambia un solo listado, solo ese se vuelve a
+procesar. Los resultados se concatenan con una columna ``Grupo``.
+"""
+import glob
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .cache_columnar import DIR_CACHE
+from .carga import cargar_roster
+from .fechas import combinar_reportes
+from .instrumentacion import RegistroEtapas
+
+EXTENSIONES_ROSTER = ('.csv', '.xlsx', '.xls')
+PATRON_GRUPO = re.compile(r'grupo[_\s-]*(\d+)', re.IGNORECASE)
+
+
+def resolver_archivos(origen):
+    """Lista ordenada de archivos de listado para una ruta, un directorio o un patrón glob."""
+    if os.path.isdir(origen):
+        return sorted(
+            os.path.join(origen, nombre) for nombre in os.listdir(origen)
+            if nombre.lower().endswith(EXTENSIONES_ROSTER) and not nombre.startswith('.')
+        )
+    if glob.has_magic(origen):
+        return sorted(ruta for ruta in glob.glob(origen) if os.path.isfile(ruta))
+    return [origen] if os.path.isfile(origen) else []
+
+
+def grupo_desde_nombre(ruta):
+    """'ListadoDeEstudiantesGrupo_051.xlsx - Hoja1.csv' -> '051'; si no hay número, el nombre del archivo."""
+    nombre = os.path.basename(ruta)
+    coincidencia = PATRON_GRUPO.search(nombre)
+    return coincidencia.group(1) if coincidencia else os.path.splitext(nombre)[0]
+
+
+def _cargar_archivo(ruta, dir_cache, medir=False):
+    # Cada proceso mide en su propio registro; las mediciones vuelven junto con el resultado
+    registro = RegistroEtapas() if medir else None
+    try:
+        df, origen = cargar_roster(ruta, dir_cache, registro)
+        return ruta, df, origen, None, registro.etapas if registro else []
+    except Exception as error:
+        return ruta, None, None, error, registro.etapas if registro else []
+
+
+def cargar_grupos(origen, dir_cache=DIR_CACHE, max_workers=None, registro=None):
+    """Carga todos los listados de ``origen`` y los concatena; con varios agrega la columna ``Grupo``.
+
+    Devuelve ``(df, cargados, errores)``: ``cargados`` es una lista de ``(ruta, origen)``
+    y ``errores`` de ``(ruta, excepción)`` para los archivos que no se pudieron leer.
+    Si ningún archivo se pudo cargar se relanza el primer error. Con un solo archivo no
+    se crea el pool y se conserva el índice original. Las mediciones de cada archivo se
+    agregan a ``registro`` (si se pasa) con el nombre del archivo.
+    """
+    archivos = resolver_archivos(origen)
+    if not archivos:
+        raise FileNotFoundError(origen)
+
+    medir = registro is not None
+    if len(archivos) == 1:
+        resultados = [_cargar_archivo(archivos[0], dir_cache, medir)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            n = len(archivos)
+            resultados = list(pool.map(_cargar_archivo, archivos, [dir_cache] * n, [medir] * n))
+
+    for ruta, _, _, _, mediciones in resultados:
+        if registro is not None:
+            registro.extender(mediciones, archivo=os.path.basename(ruta))
+    errores = [(ruta, error) for ruta, _, _, error, _ in resultados if error is not None]
+    validos = [(ruta, df, origen_df) for ruta, df, origen_df, error, _ in resultados if error is None]
+    if not validos:
+        raise errores[0][1]
+
+    huellas = []
+    partes = []
+    for ruta, df, _ in validos:
+        huellas.append(df.attrs.get('huella', ruta))
+        # Con un solo listado la columna tendría un único valor: no hay grupos que filtrar
+        partes.append(df.assign(Grupo=grupo_desde_nombre(ruta)) if len(validos) > 1 else df)
+    df = partes[0] if len(partes) == 1 else pd.concat(partes, ignore_index=True)
+    df.attrs['huella'] = hashlib.sha256('|'.join(huellas).encode('utf-8')).hexdigest()[:32]
+    df.attrs['fechas'] = combinar_reportes(*(parte.attrs.get('fechas') for parte in partes))
+    return df, [(ruta, origen_df) for ruta, _, origen_df in validos], errores
@@ -0,0 +1,83 @@
+"""Medición por etapa del pipeline: tiempo, filas de entrada/salida y variación de memoria.
+
+Uso::
+
+    registro = RegistroEtapas()
+    with medir_etapa(registro, 'lectura') as medicion:
+        df = leer(...)
+        medicion['filas_salida'] = len(df)
+
+Con ``registro=None`` las etapas no se miden (costo nulo fuera del modo debug).
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger('dashboard_estudiantil')
+
+_PAGINA_BYTES = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def memoria_proceso_mb():
+    """Memoria residente (RSS) actual del proceso en MB, o ``None`` si no se puede medir."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * _PAGINA_BYTES / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def configurar_logs(nivel=logging.INFO):
+    """Asegura que el logger del dashboard emita en ``nivel`` (con un handler a stderr si no tiene)."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(nivel)
+
+
+class RegistroEtapas:
+    """Lista de mediciones por etapa; opcionalmente emite cada una como log JSON."""
+
+    def __init__(self, emitir_logs=False):
+        self.etapas = []
+        self.emitir_logs = emitir_logs
+        if emitir_logs:
+            configurar_logs()
+
+    def agregar(self, medicion):
+        self.etapas.append(medicion)
+        if self.emitir_logs:
+            logger.info(json.dumps(medicion, ensure_ascii=False, default=str))
+
+    def extender(self, mediciones, **extra):
+        for medicion in mediciones:
+            self.agregar({**medicion, **extra})
+
+    def como_dataframe(self):
+        columnas = ['etapa', 'segundos', 'filas_entrada', 'filas_salida', 'memoria_delta_mb']
+        df = pd.DataFrame(self.etapas)
+        return df.reindex(columns=columnas + [col for col in df.columns if col not in columnas])
+
+
+@contextmanager
+def medir_etapa(registro, nombre, filas_entrada=None):
+    """Mide el bloque y agrega la medición a ``registro``; el bloque puede fijar ``filas_salida``."""
+    medicion = {'etapa': nombre, 'filas_entrada': filas_entrada, 'filas_salida': None}
+    if registro is None:
+        yield medicion
+        return
+    memoria_inicial = memoria_proceso_mb()
+    inicio = time.perf_counter()
+    try:
+        yield medicion
+    finally:
+        medicion['segundos'] = round(time.perf_counter() - inicio, 6)
+        memoria_final = memoria_proceso_mb()
+        if memoria_inicial is not None and memoria_final is not None:
+            medicion['memoria_delta_mb'] = round(memoria_final - memoria_inicial, 2)
+        registro.agregar(medicion)
@@ -0,0 +1,82 @@
+"""Detección del formato del listado (Excel o CSV) y lectura en una sola pasada.
+
+El formato se decide por los *magic bytes* del archivo y el separador/encoding de los
+CSV a partir de una muestra, sin importar la extensión del nombre.
+"""
+import codecs
+import csv
+from collections import namedtuple
+
+import pandas as pd
+
+TAMANO_MUESTRA = 64 * 1024
+FIRMA_XLSX = b'PK\x03\x04'                       # contenedor ZIP (xlsx/xlsm)
+FIRMA_XLS = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # contenedor OLE2 (xls antiguo)
+SEPARADORES = ';,\t|'
+
+FormatoArchivo = namedtuple('FormatoArchivo', ['tipo', 'sep', 'encoding'])
+
+
+class ErrorFormato(ValueError):
+    """No se pudo interpretar el contenido del archivo como Excel ni como CSV."""
+
+
+class ErrorArchivoVacio(ErrorFormato):
+    """El archivo existe pero no trae filas."""
+
+
+def _detectar_encoding(muestra):
+    if muestra.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # final=False tolera un carácter multibyte cortado al final de la muestra
+        codecs.getincrementaldecoder('utf-8')().decode(muestra, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def _detectar_separador(texto):
+    try:
+        return csv.Sniffer().sniff(texto, delimiters=SEPARADORES).delimiter
+    except csv.Error:
+        # Sin patrón claro: el separador más frecuente del encabezado (';' gana empates, como antes)
+        encabezado = texto.splitlines()[0] if texto else ''
+        return max(SEPARADORES, key=encabezado.count)
+
+
+def detectar_formato(ruta):
+    """Devuelve el ``FormatoArchivo`` del listado leyendo solo los primeros bytes."""
+    with open(ruta, 'rb') as archivo:
+        muestra = archivo.read(TAMANO_MUESTRA)
+    if muestra.startswith(FIRMA_XLSX):
+        return FormatoArchivo('xlsx', None, None)
+    if muestra.startswith(FIRMA_XLS):
+        return FormatoArchivo('xls', None, None)
+    encoding = _detectar_encoding(muestra)
+    texto = muestra.decode(encoding, errors='ignore')
+    return FormatoArchivo('csv', _detectar_separador(texto), encoding)
+
+
+def leer_roster(ruta, formato=None):
+    """Lee el listado crudo con el formato detectado (un solo intento de parseo).
+
+    Devuelve ``(df, formato)``. Lanza ``ErrorFormato`` si el contenido no es legible,
+    ``ErrorArchivoVacio`` si no hay filas e ``ImportError`` si falta el motor de Excel.
+    """
+    formato = formato or detectar_formato(ruta)
+    try:
+        if formato.tipo == 'csv':
+            df = pd.read_csv(ruta, sep=formato.sep, encoding=formato.encoding, header='infer')
+        else:
+            df = pd.read_excel(ruta)
+    except ImportError:
+        raise
+    except Exception as e_lectura:
+        raise ErrorFormato(f"No se pudo leer '{ruta}' como {formato.tipo.upper()}: {e_lectura}") from e_lectura
+
+    if df.empty:
+        raise ErrorArchivoVacio(f"El archivo '{ruta}' no tiene filas.")
+    if formato.tipo == 'csv' and df.shape[1] <= 2:
+        raise ErrorFormato(f"El separador detectado '{formato.sep}' no produce columnas válidas en '{ruta}'.")
+    return df, formato
@@ -0,0 +1,31 @@
+"""Representación compacta en memoria del listado procesado.
+
+Las columnas categóricas pasan a ``category`` (un código entero por fila en lugar de un
+objeto str), las medidas a ``float32`` y la Edad a ``int16`` cuando no tiene vacíos.
+El DataFrame resultante se comparte entre sesiones y debe tratarse como solo lectura.
+"""
+import numpy as np
+
+COLUMNAS_CATEGORIA = ['Grupo', 'RH', 'Color_Cabello', 'Barrio_Residencia', 'Talla_Zapato', 'Clasificación IMC']
+COLUMNAS_FLOAT32 = ['Estatura', 'Peso', 'IMC']
+
+
+def memoria_mb(df):
+    """Memoria ocupada por el DataFrame (incluido el contenido de los objetos) en MB."""
+    if df is None:
+        return 0.0
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def compactar_roster(df):
+    """Devuelve una versión compacta del listado con los tipos más pequeños que conservan los datos."""
+    conversiones = {col: 'category' for col in COLUMNAS_CATEGORIA if col in df.columns}
+    conversiones.update({col: np.float32 for col in COLUMNAS_FLOAT32 if col in df.columns})
+    if 'Edad' in df.columns:
+        edad = df['Edad']
+        sin_vacios = not edad.isna().any()
+        cabe_en_int16 = sin_vacios and (edad.empty or (edad.min() >= np.iinfo(np.int16).min and edad.max() <= np.iinfo(np.int16).max))
+        conversiones['Edad'] = np.int16 if cabe_en_int16 else np.float32
+    compacto = df.astype(conversiones)
+    compacto.attrs = dict(df.attrs)
+    return compacto
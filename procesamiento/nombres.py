@@ -0,0 +1,91 @@
+"""Índice de nombres normalizados para seleccionar estudiantes sin recorrer la tabla.
+
+Los nombres se normalizan sin tildes, en minúsculas y con espacios simples; la búsqueda
+exacta es un acceso a diccionario y la búsqueda por prefijo una bisección sobre las
+claves ordenadas.
+"""
+import bisect
+import functools
+import re
+import sys
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+LIMITE_SUGERENCIAS = 50
+
+
+def normalizar_nombre(nombre):
+    """'  María  JOSÉ ' -> 'maria jose'."""
+    descompuesto = unicodedata.normalize('NFKD', str(nombre))
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_tildes.lower().split())
+
+
+@functools.lru_cache(maxsize=1)
+def _patron_combinantes():
+    """Clase de caracteres con todo lo que ``unicodedata.combining`` marca (la misma regla que la versión escalar)."""
+    rangos = []
+    for codigo in range(sys.maxunicode + 1):
+        if unicodedata.combining(chr(codigo)):
+            if rangos and rangos[-1][1] == codigo - 1:
+                rangos[-1][1] = codigo
+            else:
+                rangos.append([codigo, codigo])
+    return '[' + ''.join(f'{re.escape(chr(inicio))}-{re.escape(chr(fin))}' for inicio, fin in rangos) + ']'
+
+
+def normalizar_nombres(serie):
+    """Versión por columna de ``normalizar_nombre``."""
+    return (serie.astype(str).str.normalize('NFKD')
+            .str.replace(_patron_combinantes(), '', regex=True)
+            .str.lower().str.split().str.join(' '))
+
+
+class IndiceNombres:
+    """Posiciones de fila por nombre normalizado, con búsqueda exacta y por prefijo."""
+
+    def __init__(self, nombres):
+        claves = normalizar_nombres(nombres)
+        codigos, unicas = pd.factorize(claves)
+        orden = np.argsort(codigos, kind='stable')
+        limites = np.searchsorted(codigos[orden], np.arange(len(unicas) + 1))
+        originales = nombres.to_numpy()
+        self.posiciones_por_clave = {}
+        self.etiquetas = {}
+        for i, clave in enumerate(unicas):
+            posiciones = orden[limites[i]:limites[i + 1]]
+            self.posiciones_por_clave[clave] = posiciones
+            self.etiquetas[clave] = originales[posiciones[0]]
+        self.claves_ordenadas = sorted(self.posiciones_por_clave)
+
+    def buscar(self, nombre):
+        """Posiciones de las filas cuyo nombre normalizado es exactamente ``nombre``."""
+        return self.posiciones_por_clave.get(normalizar_nombre(nombre), np.empty(0, dtype=np.int64))
+
+    def claves_con_prefijo(self, prefijo, limite=None):
+        """Claves normalizadas que empiezan por ``prefijo``, en orden alfabético."""
+        prefijo = normalizar_nombre(prefijo)
+        inicio = bisect.bisect_left(self.claves_ordenadas, prefijo)
+        fin = bisect.bisect_left(self.claves_ordenadas, prefijo + '\uffff')
+        if limite is not None:
+            fin = min(fin, inicio + limite)
+        return self.claves_ordenadas[inicio:fin]
+
+    def sugerencias(self, prefijo, limite=LIMITE_SUGERENCIAS):
+        """Nombres tal como aparecen en el listado para un cuadro de búsqueda (type-ahead)."""
+        return [self.etiquetas[clave] for clave in self.claves_con_prefijo(prefijo, limite)]
+
+    def posiciones(self, nombre):
+        """Coincidencia exacta o, si no la hay, todas las filas cuyo nombre empieza por ``nombre``.
+
+        Así 'Samuel Alzate' encuentra a 'SAMUEL ALZATE ECHEVERRI' sin escanear la tabla.
+        """
+        exactas = self.buscar(nombre)
+        if len(exactas):
+            return exactas
+        claves = self.claves_con_prefijo(nombre)
+        if not claves:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.posiciones_por_clave[clave] for clave in claves]))
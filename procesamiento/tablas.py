@@ -0,0 +1,90 @@
+"""Tabla paginada en el servidor para listados grandes (panel de debug, filas filtradas).
+
+El DataFrame compartido se convierte una sola vez a una tabla Arrow; cada página es un
+``slice`` (sin copia) o un ``take`` de esa tabla, y solo esas filas pasan a pandas y al
+navegador. El orden por cada columna se calcula una vez (``sort_indices`` de Arrow) y se
+reutiliza para todas las páginas, sesiones y selecciones de filas: el costo de cada
+página depende de su tamaño, no del tamaño del listado.
+pyarrow es opcional: sin él las páginas salen de ``DataFrame.iloc``/``take``.
+"""
+import threading
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - dependencia opcional
+    pa = pc = None
+
+TAMANOS_PAGINA = [25, 50, 100, 250]
+
+
+def _a_arrow(df):
+    """Tabla Arrow del DataFrame; las columnas object con tipos mezclados pasan a texto."""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        mezcladas = {col: str for col in df.columns if df[col].dtype == object}
+        return pa.Table.from_pandas(df.astype(mezcladas), preserve_index=False)
+
+
+class TablaPaginada:
+    """Páginas ordenadas y filtradas de un DataFrame de solo lectura."""
+
+    def __init__(self, df):
+        self.columnas = list(df.columns)
+        self.total = len(df)
+        self._df = None if pa is not None else df
+        self._tabla = _a_arrow(df) if pa is not None else None
+        self._ordenes = {}
+        self._lock = threading.Lock()
+
+    def orden(self, columna, ascendente=True):
+        """Posiciones de todas las filas ordenadas por ``columna`` (vacíos al final); se calcula una vez."""
+        clave = (columna, ascendente)
+        with self._lock:
+            if clave in self._ordenes:
+                return self._ordenes[clave]
+        if self._tabla is not None:
+            valores = self._tabla.column(columna)
+            if pa.types.is_dictionary(valores.type):
+                valores = valores.cast(valores.type.value_type)
+            orden = pc.array_sort_indices(
+                valores.combine_chunks(), order='ascending' if ascendente else 'descending', null_placement='at_end',
+            ).to_numpy()
+        else:
+            serie = self._df[columna].reset_index(drop=True)
+            orden = serie.sort_values(ascending=ascendente, na_position='last', kind='stable').index.to_numpy()
+        with self._lock:
+            self._ordenes[clave] = orden
+        return orden
+
+    def posiciones(self, posiciones=None, columna=None, ascendente=True):
+        """Posiciones visibles en orden: todas o solo ``posiciones`` (p. ej. la selección filtrada)."""
+        if columna is None:
+            return None if posiciones is None else np.asarray(posiciones)
+        orden = self.orden(columna, ascendente)
+        if posiciones is None:
+            return orden
+        # Orden global restringido a la selección: una máscara en O(n), sin volver a ordenar
+        marca = np.zeros(self.total, dtype=bool)
+        marca[posiciones] = True
+        return orden[marca[orden]]
+
+    def pagina(self, numero, tamano, posiciones=None, columna=None, ascendente=True):
+        """DataFrame con la página ``numero`` (desde 1) de ``tamano`` filas."""
+        visibles = self.posiciones(posiciones, columna, ascendente)
+        inicio = (numero - 1) * tamano
+        if visibles is None:
+            fin = min(inicio + tamano, self.total)
+            if self._tabla is not None:
+                return self._tabla.slice(inicio, max(fin - inicio, 0)).to_pandas()
+            return self._df.iloc[inicio:fin]
+        seleccion = visibles[inicio:inicio + tamano]
+        if self._tabla is not None:
+            return self._tabla.take(pa.array(seleccion, type=pa.int64())).to_pandas()
+        return self._df.take(seleccion)
+
+    def total_filas(self, posiciones=None):
+        return self.total if posiciones is None else len(posiciones)
@@ -0,0 +1,154 @@
+"""Consultas DuckDB contra el cubo y ``top5`` en pandas, y el predicado de los filtros."""
+import numpy as np
+import pytest
+
+from benchmarks.generar_roster import generar_roster, guardar_roster
+from procesamiento import (
+    CuboDatos, IndiceFiltros, IndiceNombres, cargar_grupos, compactar_roster, construir_predicado,
+    resumen_desde_filas, top5,
+)
+from procesamiento.cubo import MEDIDAS
+
+duckdb = pytest.importorskip('duckdb')
+pytest.importorskip('pyarrow')
+
+from procesamiento import ConsultasSQL  # noqa: E402
+
+TABLAS_CONTEO = ['conteo_edad', 'conteo_rh', 'conteo_tallas']
+TABLAS_TOP = ['top_cabello', 'top_barrios']
+
+
+@pytest.fixture(scope='module')
+def datos(tmp_path_factory):
+    directorio = tmp_path_factory.mktemp('listados')
+    archivos = []
+    for i, (filas, grupo) in enumerate([(700, '001'), (400, '050')]):
+        ruta = str(directorio / f'ListadoGrupo_{grupo}.csv')
+        guardar_roster(generar_roster(filas, semilla=i), ruta)
+        archivos.append(ruta)
+    dir_cache = str(directorio / 'cache')
+    df, _, _ = cargar_grupos(str(directorio), dir_cache, max_workers=1)
+    base = compactar_roster(df.dropna(subset=MEDIDAS))
+    return base, ConsultasSQL.desde_listados(archivos, dir_cache)
+
+
+def _casos(base):
+    indice = IndiceFiltros(base)
+    return [
+        ({}, {}),
+        ({'RH': indice.valores('RH')[:2]}, {'Edad': (19, 24)}),
+        ({'Barrio_Residencia': indice.valores('Barrio_Residencia')[:3]}, {'Estatura': (165, 180)}),
+        ({'Grupo': ['050'], 'Color_Cabello': ['Negro']}, {'Estatura': (160.0, 175.0)}),
+        ({'RH': ['ZZ']}, {}),
+    ]
+
+
+def _comparar_resumen(esperado, obtenido):
+    assert obtenido.total_estudiantes == esperado.total_estudiantes
+    np.testing.assert_allclose(obtenido[1:5], esperado[1:5], rtol=1e-5)
+    for campo in TABLAS_CONTEO:
+        x, y = getattr(esperado, campo), getattr(obtenido, campo)
+        columna = x.columns[0]
+        convertir = str if campo == 'conteo_rh' else float
+        assert list(x[columna].astype(object).map(convertir)) == list(y[columna].astype(object).map(convertir))
+        assert list(x['Conteo']) == list(y['Conteo'])
+    for campo in TABLAS_TOP:
+        # Los empates en el conteo pueden ordenarse distinto; el conteo debe coincidir
+        assert list(getattr(esperado, campo)['Conteo']) == list(getattr(obtenido, campo)['Conteo'])
+
+
+def test_resumen_igual_al_cubo(datos):
+    base, sql = datos
+    cubo = CuboDatos(base)
+    for categoricos, rangos in _casos(base):
+        _comparar_resumen(cubo.resumen(categoricos, rangos), sql.resumen(categoricos, rangos))
+
+
+@pytest.mark.parametrize('integrante', ['SAMUEL ALZATE ECHEVERRI', 'maría', 'nadie'])
+def test_resumen_con_integrante(datos, integrante):
+    base, sql = datos
+    posiciones = IndiceNombres(base['Nombre_Completo']).posiciones(integrante)
+    filas = base.take(posiciones) if posiciones is not None else base
+    _comparar_resumen(resumen_desde_filas(filas), sql.resumen(integrante=integrante))
+
+
+@pytest.mark.parametrize('columna', ['Estatura', 'Peso'])
+def test_top5_igual_a_pandas(datos, columna):
+    base, sql = datos
+    indice = IndiceFiltros(base)
+    for categoricos, rangos in _casos(base):
+        posiciones = indice.seleccionar(categoricos, rangos)
+        filas = base if posiciones is None else base.take(posiciones)
+        esperado, obtenido = top5(filas, columna), sql.top5(columna, categoricos, rangos)
+        assert list(obtenido.index) == list(esperado.index)
+        assert list(obtenido.columns) == list(esperado.columns)
+        np.testing.assert_allclose(obtenido[columna].to_numpy(float), esperado[columna].to_numpy(float), rtol=1e-5)
+
+
+def test_predicado_sin_filtros():
+    sql, parametros = construir_predicado()
+    assert parametros == []
+    assert sql == ' AND '.join(f'"{col}" IS NOT NULL' for col in MEDIDAS)
+
+
+def test_predicado_valores_como_parametros():
+    sql, parametros = construir_predicado(
+        {'RH': ["O+'; DROP TABLE roster; --", 'A+'], 'Barrio_Residencia': [], 'Columna_Desconocida': ['x']},
+        {'Edad': (18, 25), 'Otra': (0, 1)},
+    )
+    assert 'DROP' not in sql and 'Columna_Desconocida' not in sql and 'Otra' not in sql
+    assert 'Barrio_Residencia' not in sql
+    assert '"RH" IN (?, ?)' in sql and '"Edad" BETWEEN ? AND ?' in sql
+    assert parametros == ["O+'; DROP TABLE roster; --", 'A+', 18.0, 25.0]
+    assert all(isinstance(valor, float) for valor in parametros[2:])
+
+
+def test_predicado_integrante_normalizado():
+    sql, parametros = construir_predicado(integrante='  Sámuel   ALZATE ')
+    assert parametros == ['samuel alzate'] * 3
+    assert 'starts_with' in sql
+
+
+def test_predicado_ejecuta_en_duckdb():
+    conexion = duckdb.connect()
+    conexion.execute(
+        'CREATE VIEW roster AS SELECT * FROM (VALUES '
+        "('Samuel Alzate', 'O+', 20, 170.0, 60.0, 20.8), "
+        "('Samuel Alzatez', 'A+', 22, 180.0, 70.0, 21.6), "
+        "('María Gómez', 'O+', 30, 160.0, 55.0, 21.5), "
+        "('Sin Peso', 'O+', 20, 170.0, NULL, NULL)"
+        ') AS t("Nombre_Completo", "RH", "Edad", "Estatura", "Peso", "IMC")'
+    )
+
+    def nombres(**filtros):
+        sql, parametros = construir_predicado(**filtros)
+        filas = conexion.execute(f'SELECT "Nombre_Completo" FROM roster WHERE {sql} ORDER BY 1', parametros).fetchall()
+        return [fila[0] for fila in filas]
+
+    assert nombres() == ['María Gómez', 'Samuel Alzate', 'Samuel Alzatez']
+    assert nombres(categoricos={'RH': ['O+']}, rangos={'Edad': (18, 25)}) == ['Samuel Alzate']
+    # Coincidencia exacta del nombre normalizado; si no la hay, por prefijo
+    assert nombres(integrante='SAMUEL ALZATE') == ['Samuel Alzate']
+    assert nombres(integrante='samuel') == ['Samuel Alzate', 'Samuel Alzatez']
+    assert nombres(integrante='maria gomez') == ['María Gómez']
+
+
+def test_limite_entero_de_estatura(tmp_path):
+    # 2.01 m pasa a 200.99999999999997 cm en float64 (la caché) y a 201.0 en float32 (el dashboard)
+    crudo = generar_roster(300, semilla=7)
+    crudo.loc[:19, 'Estatura'] = '2.01'
+    ruta = str(tmp_path / 'ListadoGrupo_002.csv')
+    guardar_roster(crudo, ruta)
+    dir_cache = str(tmp_path / 'cache')
+    df, _, _ = cargar_grupos(ruta, dir_cache)
+    base = compactar_roster(df.dropna(subset=MEDIDAS))
+    sql = ConsultasSQL.desde_listados([ruta], dir_cache)
+    cubo, indice = CuboDatos(base), IndiceFiltros(base)
+    assert (base['Estatura'] == 201).sum() >= 10
+
+    for rango in [(201, 210), (150, 200), (150, 201)]:
+        rangos = {'Estatura': rango}
+        esperado = len(indice.seleccionar(rangos=rangos))
+        assert cubo.resumen(rangos=rangos).total_estudiantes == esperado
+        assert sql.resumen(rangos=rangos).total_estudiantes == esperado
+        assert len(sql.top5('Estatura', rangos=rangos)) == min(esperado, 5)
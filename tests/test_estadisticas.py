@@ -0,0 +1,36 @@
+"""Estadísticas acumuladas por bloques (momentos exactos, cuartiles del sketch) contra las exactas."""
+import numpy as np
+import pandas as pd
+
+from procesamiento import SketchCuantiles, acumular, estadisticas_columnas
+
+COLUMNAS = ['Estatura', 'Peso']
+
+
+def _rango(ordenados, valor):
+    return np.searchsorted(ordenados, valor) / len(ordenados)
+
+
+def test_acumular_por_bloques_igual_a_exactas():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'Estatura': rng.normal(170, 9, 200_000), 'Peso': rng.normal(66, 11, 200_000)})
+    df.loc[::97, 'Peso'] = np.nan
+    aproximadas = acumular(df, COLUMNAS, tamano_bloque=10_000).estadisticas()
+    exactas = estadisticas_columnas(df, COLUMNAS)
+    for col in COLUMNAS:
+        assert aproximadas[col].count == exactas[col].count
+        np.testing.assert_allclose(aproximadas[col][1:5], exactas[col][1:5])
+        ordenados = np.sort(df[col].dropna().to_numpy())
+        for probabilidad, cuartil in zip([0.25, 0.5, 0.75], aproximadas[col][5:]):
+            assert abs(_rango(ordenados, cuartil) - probabilidad) < 0.02
+
+
+def test_combinar_sketches_de_varios_grupos():
+    rng = np.random.default_rng(1)
+    partes = [rng.normal(170, 9, n) for n in (7, 3_000, 150_000)]
+    sketch = SketchCuantiles(semilla=0)
+    for i, parte in enumerate(partes):
+        sketch.combinar(SketchCuantiles(semilla=i + 1).agregar(parte))
+    assert all(len(nivel) <= capacidad for nivel, capacidad in zip(sketch.niveles, sketch._capacidades))
+    ordenados = np.sort(np.concatenate(partes))
+    assert abs(_rango(ordenados, sketch.cuantiles([0.5])[0]) - 0.5) < 0.02
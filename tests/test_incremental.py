@@ -0,0 +1,156 @@
+"""El listado incremental (agregar, editar y borrar filas) contra un recálculo completo."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.generar_roster import generar_roster, guardar_roster
+from procesamiento import ORIGEN_CACHE, CuboDatos, RosterIncremental, cargar_roster, compactar_roster, huella_archivo
+from procesamiento.cache_columnar import leer_cache
+from procesamiento.cubo import MEDIDAS
+
+FILAS = 600
+FILTROS = {
+    'categoricos': {'RH': ['O+', 'A+'], 'Color_Cabello': ['Negro', 'Castaño']},
+    'rangos': {'Edad': (18, 25), 'Estatura': (160, 185)},
+}
+TABLAS_CONTEO = ['conteo_edad', 'conteo_rh', 'top_cabello', 'conteo_tallas', 'top_barrios']
+
+
+@pytest.fixture
+def crudo():
+    return generar_roster(FILAS, semilla=3)
+
+
+def _escribir(df, ruta, paso):
+    """Escribe el listado con una fecha de modificación distinta en cada paso."""
+    guardar_roster(df, ruta)
+    mtime = os.stat(ruta).st_mtime_ns + paso * 1_000_000_000
+    os.utime(ruta, ns=(mtime, mtime))
+
+
+def _comparar_con_recalculo(roster, ruta, dir_cache):
+    completo, _ = cargar_roster(ruta, dir_cache)
+    # En disco queda lo mismo que escribe cargar_roster (float64, sin categorías)
+    en_disco = leer_cache(roster.huella, roster.dir_cache)
+    assert en_disco is not None
+    pd.testing.assert_frame_equal(en_disco, leer_cache(huella_archivo(ruta), dir_cache))
+
+    completo = compactar_roster(completo)
+    pd.testing.assert_frame_equal(
+        roster.estado.df.reset_index(drop=True).astype(object),
+        completo.reset_index(drop=True).astype(object),
+        check_dtype=False,
+    )
+
+    base = completo.dropna(subset=MEDIDAS)
+    for filtros in ({}, FILTROS):
+        esperado = CuboDatos(base).resumen(**filtros)
+        obtenido = roster.estado.cubo.resumen(**filtros)
+        assert obtenido.total_estudiantes == esperado.total_estudiantes
+        np.testing.assert_allclose(obtenido[1:5], esperado[1:5])
+        for campo in TABLAS_CONTEO:
+            pd.testing.assert_frame_equal(
+                getattr(obtenido, campo).reset_index(drop=True),
+                getattr(esperado, campo).reset_index(drop=True),
+                check_dtype=False, check_categorical=False,
+            )
+
+
+@pytest.fixture
+def ruta(tmp_path, crudo):
+    ruta = str(tmp_path / 'ListadoGrupo_001.csv')
+    _escribir(crudo.iloc[:500], ruta, 0)
+    return ruta
+
+
+def test_agregar_filas(ruta, crudo, tmp_path):
+    roster = RosterIncremental(ruta, str(tmp_path / 'cache'))
+    _escribir(crudo, ruta, 1)
+    cambios = roster.actualizar()
+    assert cambios.solo_agregadas
+    assert (cambios.nuevos, cambios.modificados, cambios.eliminados) == (100, 0, 0)
+    _comparar_con_recalculo(roster, ruta, str(tmp_path / 'completo'))
+
+
+def test_agregar_filas_con_otro_formato_de_fecha(ruta, crudo, tmp_path):
+    # El listado inicial solo tiene fechas dd/mm/aaaa y el lote agregado solo aaaa-mm-dd
+    nacimiento = pd.Timestamp('1998-01-01') + pd.to_timedelta(np.arange(FILAS) * 7 % 4000, unit='D')
+    fechas = pd.Series(nacimiento.strftime('%d/%m/%Y'), index=crudo.index)
+    fechas.iloc[500:] = nacimiento[500:].strftime('%Y-%m-%d')
+    crudo = crudo.assign(Fecha_Nacimiento=fechas)
+    _escribir(crudo.iloc[:500], ruta, 1)
+    roster = RosterIncremental(ruta, str(tmp_path / 'cache'))
+    _escribir(crudo, ruta, 2)
+    assert roster.actualizar().solo_agregadas
+    assert roster.estado.df['Edad'].notna().all()
+    _comparar_con_recalculo(roster, ruta, str(tmp_path / 'completo'))
+
+
+def test_editar_fila(ruta, crudo, tmp_path):
+    roster = RosterIncremental(ruta, str(tmp_path / 'cache'))
+    editado = crudo.iloc[:500].copy()
+    editado.iloc[3, editado.columns.get_loc('Peso')] = '99'
+    editado.iloc[7, editado.columns.get_loc('RH')] = 'AB-'
+    _escribir(editado, ruta, 1)
+    cambios = roster.actualizar()
+    assert (cambios.nuevos, cambios.modificados, cambios.eliminados) == (0, 2, 0)
+    _comparar_con_recalculo(roster, ruta, str(tmp_path / 'completo'))
+
+
+def test_borrar_filas(ruta, crudo, tmp_path):
+    roster = RosterIncremental(ruta, str(tmp_path / 'cache'))
+    _escribir(crudo.iloc[:500].drop(crudo.index[10:60]), ruta, 1)
+    cambios = roster.actualizar()
+    assert (cambios.nuevos, cambios.modificados, cambios.eliminados) == (0, 0, 50)
+    _comparar_con_recalculo(roster, ruta, str(tmp_path / 'completo'))
+
+
+def test_arranque_desde_cache_actualizada(ruta, crudo, tmp_path):
+    dir_cache = str(tmp_path / 'cache')
+    roster = RosterIncremental(ruta, dir_cache)
+    assert roster.origen != ORIGEN_CACHE
+    _escribir(crudo.iloc[:550], ruta, 1)
+    roster.actualizar()
+
+    # La actualización quedó en la caché: el nuevo arranque no parsea el archivo
+    reiniciado = RosterIncremental(ruta, dir_cache)
+    assert reiniciado.origen == ORIGEN_CACHE
+    _comparar_con_recalculo(reiniciado, ruta, str(tmp_path / 'completo'))
+
+    # Y sigue actualizando con los hashes de fila guardados
+    _escribir(crudo.iloc[20:], ruta, 2)
+    cambios = reiniciado.actualizar()
+    assert (cambios.nuevos, cambios.eliminados) == (50, 20)
+    _comparar_con_recalculo(reiniciado, ruta, str(tmp_path / 'completo_2'))
+
+
+def test_cache_conserva_solo_la_huella_actual(ruta, crudo, tmp_path):
+    dir_cache = tmp_path / 'cache'
+    roster = RosterIncremental(ruta, str(dir_cache))
+    for paso, filas in enumerate([520, 540, 560, 580, 600], start=1):
+        _escribir(crudo.iloc[:filas], ruta, paso)
+        roster.actualizar()
+        # La huella sale del hash acumulado y coincide con la del archivo completo
+        assert roster.huella == huella_archivo(ruta)
+        assert sorted(os.listdir(dir_cache)) == [f'{roster.huella}.filas.parquet', f'{roster.huella}.parquet']
+
+
+def test_cambios_pendientes_con_linea_a_medio_escribir(ruta, crudo, tmp_path):
+    roster = RosterIncremental(ruta, str(tmp_path / 'cache'))
+    huella_inicial = roster.huella
+    _escribir(crudo.iloc[:550], ruta, 1)
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    # Última línea sin terminar: se incorporan las completas, pero la caché no se escribe
+    with open(ruta, 'wb') as archivo:
+        archivo.write(contenido[:-10])
+    assert roster.actualizar().nuevos == 49
+    assert roster.huella == huella_inicial
+
+    with open(ruta, 'wb') as archivo:
+        archivo.write(contenido)
+    assert roster.actualizar().nuevos == 1
+    assert roster.huella != huella_inicial
+    _comparar_con_recalculo(roster, ruta, str(tmp_path / 'completo'))
@@ -0,0 +1,19 @@
+"""Carga de uno o varios listados con ``cargar_grupos``."""
+from benchmarks.generar_roster import generar_roster, guardar_roster
+from procesamiento import cargar_grupos
+
+
+def test_un_listado_sin_columna_grupo(tmp_path):
+    ruta = str(tmp_path / 'ListadoGrupo_051.csv')
+    guardar_roster(generar_roster(50), ruta)
+    df, cargados, errores = cargar_grupos(ruta, str(tmp_path / 'cache'))
+    assert 'Grupo' not in df.columns
+    assert len(cargados) == 1 and not errores
+
+
+def test_varios_listados_con_columna_grupo(tmp_path):
+    for semilla, grupo in enumerate(['001', '050']):
+        guardar_roster(generar_roster(50, semilla), str(tmp_path / f'ListadoGrupo_{grupo}.csv'))
+    df, cargados, _ = cargar_grupos(str(tmp_path), str(tmp_path / 'cache'), max_workers=1)
+    assert len(cargados) == 2
+    assert df['Grupo'].value_counts().to_dict() == {'001': 50, '050': 50}
@@ -0,0 +1,21 @@
+"""Normalización de nombres: la versión por columna sigue la misma regla que la escalar."""
+import sys
+import unicodedata
+
+import pandas as pd
+
+from procesamiento import IndiceNombres, normalizar_nombre, normalizar_nombres
+
+
+def test_normalizar_nombres_igual_a_la_version_escalar():
+    combinantes = [chr(codigo) for codigo in range(sys.maxunicode + 1) if unicodedata.combining(chr(codigo))]
+    serie = pd.Series([f'Ana{marca} López' for marca in combinantes] + ['  María  JOSÉ ', 'Ñandú', 'Zoë', 'ﬁna'])
+    assert normalizar_nombres(serie).tolist() == serie.map(normalizar_nombre).tolist()
+
+
+def test_indice_encuentra_marcas_fuera_del_bloque_latino():
+    # U+1AB0 y U+20D0 son marcas combinantes fuera de U+0300–U+036F
+    nombres = pd.Series(['Sa᪰muel Alzate', 'Jero⃐nimo Rojas', 'Erika Giraldo'])
+    indice = IndiceNombres(nombres)
+    assert list(indice.posiciones('Samuel Alzate')) == [0]
+    assert list(indice.posiciones('jeronimo')) == [1]